@@ -0,0 +1,181 @@
+import heapq
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Same thresholds as TenderScraper.calculate_scores: days left -> urgency,
+# none once the deadline has passed (days <= -1)
+URGENCY_BINS = [-np.inf, -1, 7, 14, 30, np.inf]
+URGENCY_LEVELS = [0.0, 1.0, 0.8, 0.6, 0.4]
+DEFAULT_DEADLINE_DAYS = 30
+DEFAULT_CONFIDENCE = 0.3
+
+
+def round_scores(values: pd.Series) -> pd.Series:
+    # Python's round, not Series.round: numpy rounds 0.925 up where round() doesn't
+    return values.map(lambda v: round(v, 2))
+
+
+def tender_frame(tenders: List[Dict], now: Optional[datetime] = None) -> pd.DataFrame:
+    """Columnar view of the fields tender scoring depends on"""
+    now = now or datetime.now()
+    frame = pd.DataFrame({
+        'deadline': pd.to_datetime([t.get('deadline') for t in tenders], errors='coerce'),
+        'confidence': [
+            sum(c.values()) / len(c) if c else np.nan
+            for c in (t.get('product_confidence') or {} for t in tenders)
+        ],
+        'signal_count': [len(t.get('signals') or []) for t in tenders]
+    })
+    # Calendar days between the dates, as TenderScraper.build_tender counts them
+    frame['deadline_days'] = (frame['deadline'].dt.normalize() - pd.Timestamp(now).normalize()).dt.days
+    frame['deadline_days'] = frame['deadline_days'].fillna(DEFAULT_DEADLINE_DAYS)
+    return frame
+
+
+def score_tenders(tenders: List[Dict], urgency_weight: float = 0.3,
+                  confidence_weight: float = 0.5, signal_weight: float = 0.1,
+                  now: Optional[datetime] = None) -> pd.DataFrame:
+    """Vectorized TenderScraper.calculate_scores over a batch, written back into the records
+
+    Returns the frame with the new urgency, confidence and overall columns.
+    """
+    if not tenders:
+        return pd.DataFrame(columns=['urgency', 'confidence', 'overall'])
+
+    frame = tender_frame(tenders, now)
+    # Bins are right-inclusive, matching the <= comparisons
+    frame['urgency'] = pd.cut(
+        frame['deadline_days'], URGENCY_BINS, labels=URGENCY_LEVELS, ordered=False
+    ).astype(float)
+    frame['confidence'] = frame['confidence'].fillna(DEFAULT_CONFIDENCE)
+    frame['overall'] = (
+        frame['urgency'] * urgency_weight
+        + frame['confidence'] * confidence_weight
+        + frame['signal_count'] * signal_weight
+    ).clip(upper=1.0)
+    for column in ('urgency', 'confidence', 'overall'):
+        frame[column] = round_scores(frame[column])
+
+    for tender, urgency, confidence, overall in zip(
+        tenders, frame['urgency'].tolist(), frame['confidence'].tolist(), frame['overall'].tolist()
+    ):
+        tender['urgency_score'] = urgency
+        tender['confidence_score'] = confidence
+        tender['overall_score'] = overall
+    return frame
+
+
+def score_companies(companies: List[Dict], urgency_weight: float,
+                    confidence_weight: float) -> pd.DataFrame:
+    """Recompute company overall_score from stored urgency and confidence"""
+    if not companies:
+        return pd.DataFrame(columns=['overall'])
+
+    frame = pd.DataFrame({
+        'urgency': [c.get('urgency_score', 0.0) for c in companies],
+        'confidence': [c.get('confidence_score', 0.0) for c in companies]
+    }, dtype=float)
+    frame['overall'] = round_scores(frame['urgency'] * urgency_weight + frame['confidence'] * confidence_weight)
+    for company, overall in zip(companies, frame['overall'].tolist()):
+        company['overall_score'] = overall
+    return frame
+
+
+def distribution(records: List[Dict], field: str) -> pd.Series:
+    """Counts of a scalar or list-valued field, most common first"""
+    values = pd.Series([r.get(field) for r in records], dtype=object)
+    if values.map(lambda v: isinstance(v, list)).any():
+        values = values.explode()
+    return values.dropna().value_counts()
+
+
+def tender_summary(tenders: List[Dict]) -> Dict[str, pd.Series]:
+    """Product, industry and signal strength distributions for a run"""
+    strengths = distribution(tenders, 'signal_strength')
+    return {
+        'products': distribution(tenders, 'products_recommended'),
+        'industries': distribution(tenders, 'industry_sector'),
+        'signal_strength': strengths.reindex(['high', 'medium', 'low'], fill_value=0)
+    }
+
+
+def company_report_aggregates(results: List[Dict], top_n: int = 10) -> Dict:
+    """Aggregates shown in the company intelligence report"""
+    frame = pd.DataFrame({
+        'overall_score': [r.get('overall_score', 0.0) for r in results],
+        'project_count': [len(r.get('projects', [])) for r in results],
+        'is_india': [r.get('country') == 'India' for r in results],
+        'has_state': [bool(r.get('state')) for r in results]
+    })
+    top_index = frame['overall_score'].nlargest(top_n, keep='first').index
+    return {
+        'total': len(results),
+        'total_projects': int(frame['project_count'].sum()),
+        'high_priority': int((frame['overall_score'] >= 0.7).sum()),
+        'avg_score': float(frame['overall_score'].mean()) if len(frame) else 0.0,
+        'top': [results[i] for i in top_index],
+        'india_companies': int(frame['is_india'].sum()),
+        'companies_with_state': int(frame['has_state'].sum())
+    }
+
+
+class ReportAggregator:
+    """Running version of company_report_aggregates for records processed one at a time
+
+    Keeps counters and a top_n heap, so memory stays flat however many
+    records pass through. start is the position of the first record, so
+    aggregators for separate shards can be merged with ties still going to
+    the earliest record.
+    """
+
+    def __init__(self, top_n: int = 10, start: int = 0):
+        self.top_n = top_n
+        self.start = start
+        self.total = 0
+        self.total_projects = 0
+        self.high_priority = 0
+        self.score_sum = 0.0
+        self.india_companies = 0
+        self.companies_with_state = 0
+        self.heap = []
+
+    def add(self, record: Dict):
+        score = record.get('overall_score', 0.0)
+        self.total_projects += len(record.get('projects', []))
+        self.high_priority += score >= 0.7
+        self.score_sum += score
+        self.india_companies += record.get('country') == 'India'
+        self.companies_with_state += bool(record.get('state'))
+        # Ties keep the earlier record, like nlargest(keep='first')
+        self._push((score, -(self.start + self.total), record))
+        self.total += 1
+
+    def _push(self, entry):
+        if len(self.heap) < self.top_n:
+            heapq.heappush(self.heap, entry)
+        else:
+            heapq.heappushpop(self.heap, entry)
+
+    def merge(self, other: 'ReportAggregator'):
+        """Fold in the aggregates of another shard"""
+        self.total += other.total
+        self.total_projects += other.total_projects
+        self.high_priority += other.high_priority
+        self.score_sum += other.score_sum
+        self.india_companies += other.india_companies
+        self.companies_with_state += other.companies_with_state
+        for entry in other.heap:
+            self._push(entry)
+
+    def result(self) -> Dict:
+        return {
+            'total': self.total,
+            'total_projects': self.total_projects,
+            'high_priority': self.high_priority,
+            'avg_score': self.score_sum / self.total if self.total else 0.0,
+            'top': [record for _, _, record in sorted(self.heap, key=lambda e: e[:2], reverse=True)],
+            'india_companies': self.india_companies,
+            'companies_with_state': self.companies_with_state
+        }
@@ -0,0 +1,106 @@
+"""Micro-benchmark for per-record field extraction.
+
+Compares the precompiled ExtractionPatterns bank against the previous
+approach of rebuilding pattern lists and calling re.search per pattern.
+
+    python benchmarks/bench_extraction.py [--repeat 200]
+"""
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tendors_script import TenderScraper  # noqa: E402
+
+TENDERS_JSON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tendors.json')
+
+
+def legacy_extract(text: str):
+    """Field extraction as it was before the compiled pattern bank"""
+    deadline = None
+    for pattern in [
+        r'\d{2}[-/]\d{2}[-/]\d{4}',
+        r'\d{4}[-/]\d{2}[-/]\d{2}',
+        r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}'
+    ]:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            deadline = match.group(0)
+            break
+
+    value = None
+    for pattern in [
+        r'₹\s*[\d,]+(?:\.\d{2})?',
+        r'INR\s*[\d,]+(?:\.\d{2})?',
+        r'USD\s*[\d,]+(?:\.\d{2})?',
+        r'\$\s*[\d,]+(?:\.\d{2})?'
+    ]:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            try:
+                value = float(re.sub(r'[^\d.]', '', match.group(0)))
+                break
+            except ValueError:
+                pass
+
+    company = "Unknown Organization"
+    for pattern in [
+        r'(?:by|for|from)\s+([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corporation|Pvt|Private))',
+        r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corporation|Pvt|Private))'
+    ]:
+        match = re.search(pattern, text)
+        if match:
+            company = match.group(1).strip()
+            break
+
+    tender_id = re.search(r'(?:tender|ref|id)[:\s#]*([A-Z0-9-]+)', text, re.I)
+    return deadline, value, company, tender_id.group(1) if tender_id else None
+
+
+def compiled_extract(scraper: TenderScraper, text: str):
+    return (
+        scraper.extract_deadline(text),
+        scraper.extract_value(text),
+        scraper.extract_company_name(text),
+        scraper.extract_tender_id(text)
+    )
+
+
+def load_records():
+    with open(TENDERS_JSON, 'r', encoding='utf-8') as f:
+        tenders = json.load(f)
+    # Listing text as scraped, plus a richer variant carrying every field
+    records = [f"{tender['title']} {tender['description']}" for tender in tenders]
+    for tender in tenders:
+        records.append(
+            f"{tender['title']} {tender['description']} Ref: {tender['tender_id']} "
+            f"by {tender['company_name']} Limited. Closing date 15 Mar 2026. "
+            f"Estimated value INR {tender['estimated_value'] or 0:,.2f}"
+        )
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    scraper = TenderScraper()
+    records = load_records()
+    total = len(records) * args.repeat
+
+    legacy = timeit.timeit(lambda: [legacy_extract(r) for r in records], number=args.repeat)
+    compiled = timeit.timeit(lambda: [compiled_extract(scraper, r) for r in records], number=args.repeat)
+
+    print(f"Records per run: {len(records)}, runs: {args.repeat}")
+    print(f"  legacy   : {legacy / total * 1e6:8.2f} us/record")
+    print(f"  compiled : {compiled / total * 1e6:8.2f} us/record")
+    print(f"  speedup  : {legacy / compiled:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
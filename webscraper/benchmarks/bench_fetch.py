@@ -0,0 +1,180 @@
+"""Load test for the fetch layer against the local stand-in portals.
+
+Starts portal_server in a separate process, points
+TenderScraper.scrape_all_websites at hundreds of virtual portals and
+reports throughput, per-request latency percentiles and retry
+amplification (HTTP requests per listing page fetched). Each portal's
+pages are followed up to --page-budget. Use --passes 2 to measure an
+ETag-revalidating rerun through the HTTP cache, and --site-extractor to
+parse the portals with their selectors instead of the generic heuristics.
+
+    python benchmarks/bench_fetch.py --portals 300 --concurrency 32 --latency 0.2 \\
+        --error-rate 0.02 --throttle-rate 0.05 [--json results.json]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from typing import Dict, List
+from urllib.parse import urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from portal_server import (  # noqa: E402
+    SITE_SELECTORS, add_arguments, portal_hosts, portal_sites, serve, simulator_from_args
+)
+
+
+def run_server(args: argparse.Namespace, hosts: List[str], ready, stop, counts):
+    """Server process: serve until stop is set, then report request counts by status"""
+    simulator = simulator_from_args(args)
+    servers, port = serve(simulator, hosts)
+    ready.put(port)
+    stop.wait()
+    # Serving threads are daemons and go away with the process
+    counts.put(simulator.requests)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def run_pass(args: argparse.Namespace, sites: List[Dict], cache_dir: str) -> Dict:
+    from tendors_script import TenderScraper
+    from rate_limit import HostRateLimiter
+    from http_cache import HTTPCache
+    from site_extractors import SiteExtractor, SiteRegistry
+
+    class LoadTestScraper(TenderScraper):
+        """Records every HTTP attempt and its latency"""
+
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self.latencies = []
+            self.attempts = 0
+            self.attempt_lock = threading.Lock()
+
+        def _get(self, url, host, **kwargs):
+            with self.attempt_lock:
+                self.attempts += 1
+            start = time.perf_counter()
+            try:
+                return super()._get(url, host, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+
+    scraper = LoadTestScraper(
+        max_concurrency=args.concurrency,
+        per_host_concurrency=args.per_host,
+        rate_limiter=HostRateLimiter(default_rate=args.rate, default_burst=args.burst,
+                                     base_backoff=args.base_backoff, max_backoff=args.max_backoff),
+        http_cache=HTTPCache(cache_dir) if args.passes > 1 else None,
+        request_timeout=args.timeout,
+        max_retries=args.retries,
+        page_budget=args.page_budget,
+        site_extractors=SiteRegistry([SiteExtractor(
+            'Virtual Portal', sorted({urlparse(site['Website URL']).hostname for site in sites}), **SITE_SELECTORS
+        )]) if args.site_extractor else None
+    )
+    start = time.perf_counter()
+    tenders = scraper.scrape_all_websites(sites, concurrent=True)
+    elapsed = time.perf_counter() - start
+    if scraper.http_cache:
+        scraper.http_cache.save()
+
+    statuses = {}
+    for (name, labels), value in scraper.metrics.counters.items():
+        if name == 'fetch_responses_total':
+            status = dict(labels)['status']
+            statuses[status] = statuses.get(status, 0) + int(value)
+    errors = sum(int(v) for (name, _), v in scraper.metrics.counters.items() if name == 'fetch_errors_total')
+    fetched = sum(count for status, count in statuses.items() if status in ('200', '304'))
+    return {
+        'portals': len(sites),
+        'seconds': round(elapsed, 3),
+        'tenders': len(tenders),
+        'portals_per_sec': round(len(sites) / elapsed, 2),
+        'requests': scraper.attempts,
+        'requests_per_sec': round(scraper.attempts / elapsed, 2),
+        'retry_amplification': round(scraper.attempts / max(fetched, 1), 3),
+        'pages_fetched': fetched,
+        'latency_p50': round(percentile(scraper.latencies, 0.50), 4),
+        'latency_p90': round(percentile(scraper.latencies, 0.90), 4),
+        'latency_p99': round(percentile(scraper.latencies, 0.99), 4),
+        'latency_max': round(max(scraper.latencies, default=0.0), 4),
+        'client_statuses': statuses,
+        'client_errors': errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--concurrency', type=int, default=32, help='TenderScraper max_concurrency')
+    parser.add_argument('--per-host', type=int, default=1, help='TenderScraper per_host_concurrency')
+    parser.add_argument('--rate', type=float, default=5.0, help='requests/sec allowed per host')
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument('--base-backoff', type=float, default=0.25)
+    parser.add_argument('--max-backoff', type=float, default=5.0)
+    parser.add_argument('--timeout', type=float, default=10.0, help='per-request timeout in seconds')
+    parser.add_argument('--retries', type=int, default=3, help='attempts per page')
+    parser.add_argument('--page-budget', type=int, default=5, help='listing pages followed per portal')
+    parser.add_argument('--site-extractor', action='store_true',
+                        help='register the stand-in portal selectors instead of using the generic parser')
+    parser.add_argument('--passes', type=int, default=1,
+                        help='runs over the same portals; later passes revalidate through the HTTP cache')
+    parser.add_argument('--json', default=None, help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    # tendors_script configures root logging at INFO when imported; quiet it afterwards
+    import tendors_script  # noqa: F401
+    logging.getLogger().setLevel(logging.WARNING)
+
+    hosts = portal_hosts(args.hosts or args.portals)
+    context = multiprocessing.get_context('spawn')
+    ready, counts, stop = context.Queue(), context.Queue(), context.Event()
+    server = context.Process(target=run_server, args=(args, hosts, ready, stop, counts), daemon=True)
+    server.start()
+    port = ready.get(timeout=60)
+    sites = portal_sites(hosts, port, args.portals)
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for n in range(args.passes):
+                result = run_pass(args, sites, cache_dir)
+                result['pass'] = n + 1
+                results.append(result)
+    finally:
+        stop.set()
+        server_counts = counts.get(timeout=30)
+        server.join(timeout=10)
+
+    for result in results:
+        print(f"pass {result['pass']}: {result['portals']} portals in {result['seconds']}s "
+              f"({result['portals_per_sec']} portals/s, {result['requests_per_sec']} req/s), "
+              f"{result['tenders']} tenders from {result['pages_fetched']} pages")
+        print(f"  latency p50 {result['latency_p50'] * 1000:.0f}ms  p90 {result['latency_p90'] * 1000:.0f}ms  "
+              f"p99 {result['latency_p99'] * 1000:.0f}ms  max {result['latency_max'] * 1000:.0f}ms")
+        print(f"  retry amplification {result['retry_amplification']}x  "
+              f"statuses {dict(sorted(result['client_statuses'].items()))}  errors {result['client_errors']}")
+    print(f"server saw {sum(server_counts.values())} requests: {dict(sorted(server_counts.items()))}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'passes': results, 'server_statuses': server_counts}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
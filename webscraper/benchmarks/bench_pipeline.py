@@ -0,0 +1,276 @@
+"""Offline benchmarks for the tender parse and company enrichment hot paths.
+
+Tender pages are replayed through TenderScraper.parse_page: synthetic
+portal listings rendered from tendors.json at each --tender-sizes container
+count (10k containers is several MB of HTML), plus any saved pages passed
+with --fixtures (a directory of .html files, or an HTTPCache directory of
+.body files). The company dataset is scaled by each --company-scales factor
+and pushed through ComprehensiveScraper.run; copies get a ' Unit N' suffix
+so the memo caches don't turn the scaled runs into cache lookups.
+
+Each case runs in a fresh process and reports records/sec, peak RSS and the
+per-stage time breakdown from the scrapers' metrics. Pages are parsed with
+the scraper defaults unless --html-parser or --full-tree say otherwise.
+
+    python benchmarks/bench_pipeline.py [--save-baseline benchmarks/baseline.json]
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json [--tolerance 0.15]
+
+With --baseline the run exits non-zero when any case's records/sec drops
+by more than the tolerance.
+"""
+import os
+import sys
+import json
+import glob
+import time
+import html
+import argparse
+import platform
+import resource
+import tempfile
+import multiprocessing
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SCRAPER_DIR)
+
+TENDERS_JSON = os.path.join(SCRAPER_DIR, 'tendors.json')
+COMPANIES_JSON = os.path.join(SCRAPER_DIR, 'Companies_data_set.json')
+PORTAL_URL = 'https://portal.example.gov.in/tenders/list'
+
+# Listing markup seen on the portals, cycled through container by container
+LAYOUTS = [
+    '<div class="tender-item"><h3>{title}</h3><p>{description}</p>'
+    '<a href="/tender/{n}">View details</a></div>',
+    '<tr class="tender-row"><td><a href="/tender/{n}">{title}</a></td>'
+    '<td><p>{description}</p></td></tr>',
+    '<li class="bid-item"><strong>{title}</strong><span>{description}</span></li>'
+]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+
+def stage_breakdown(metrics) -> dict:
+    """Total wall seconds per stage from a Metrics registry"""
+    return {
+        dict(labels)['stage']: round(histogram.sum, 6)
+        for (name, labels), histogram in sorted(metrics.histograms.items())
+        if name == 'stage_seconds'
+    }
+
+
+def render_page(tenders: list, containers: int) -> bytes:
+    """Portal listing page with the given number of tender containers"""
+    rows = []
+    for n in range(containers):
+        tender = tenders[n % len(tenders)]
+        layout = LAYOUTS[n % len(LAYOUTS)]
+        rows.append(layout.format(
+            n=n,
+            title=html.escape(tender['title']),
+            description=html.escape(f"{tender['description']} Ref: {tender['tender_id']}")
+        ))
+    body = '\n'.join(rows)
+    return (
+        '<html><head><title>Active Tenders</title></head><body>'
+        '<div class="header"><h1>e-Procurement Portal</h1></div>'
+        f'<table class="listing">{body}</table></body></html>'
+    ).encode('utf-8')
+
+
+def fixture_pages(directory: str) -> list:
+    paths = sorted(glob.glob(os.path.join(directory, '*.html')) + glob.glob(os.path.join(directory, '*.body')))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def bench_tender_page(case: str, content: bytes, min_seconds: float, settings: dict) -> dict:
+    from tendors_script import TenderScraper
+
+    scraper = TenderScraper(**settings)
+    scraper.parse_page(PORTAL_URL, content)  # warm up caches and the automaton
+    scraper.metrics.histograms.clear()
+
+    passes = tenders = 0
+    start = time.perf_counter()
+    while True:
+        tenders += len(scraper.parse_page(PORTAL_URL, content))
+        passes += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+
+    return {
+        'case': case,
+        'pages': passes,
+        'html_parser': scraper.html_parser,
+        'targeted_parse': scraper.targeted_parse,
+        'page_bytes': len(content),
+        'seconds': round(elapsed, 4),
+        'records': tenders,
+        'records_per_sec': round(tenders / elapsed, 2),
+        'pages_per_sec': round(passes / elapsed, 2),
+        'mb_per_sec': round(len(content) * passes / elapsed / 1e6, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'stages': stage_breakdown(scraper.metrics)
+    }
+
+
+def company_records(scale: int):
+    """The company dataset in the enriched record shape, repeated scale times"""
+    from website_script import CompanyCrawler, ProjectTemplates, SignalPatterns, Config, company_key
+
+    with open(COMPANIES_JSON, 'r', encoding='utf-8') as f:
+        companies = json.load(f)
+    for copy_index in range(scale):
+        for i, company in enumerate(companies):
+            name = company['name'] if copy_index == 0 else f"{company['name']} Unit {copy_index}"
+            industry = CompanyCrawler.INDUSTRY_NAMES.get(company.get('industry'), 'Other')
+            key = company_key({'company_name': name})
+            projects = ProjectTemplates.generate_projects(industry, 2, key)
+            level, pattern = SignalPatterns.get_pattern(len(projects), industry, key)
+            urgency = sum(pattern['urgency_range']) / 2
+            confidence = sum(pattern['confidence_range']) / 2
+            yield {
+                'company_id': f"C{copy_index * len(companies) + i + 1:06d}",
+                'company_name': name,
+                'source_type': 'company_website',
+                'source_url': company.get('website'),
+                'projects': projects,
+                'industry_sector': industry,
+                'location': ', '.join(company.get('locations', [])) or 'India',
+                'signals': pattern['signals'],
+                'signal_strength': level,
+                'urgency_score': round(urgency, 2),
+                'confidence_score': round(confidence, 2),
+                'overall_score': round(urgency * Config.URGENCY_WEIGHT + confidence * Config.CONFIDENCE_WEIGHT, 2)
+            }
+
+
+def bench_companies(case: str, input_path: str, count: int, workdir: str) -> dict:
+    from website_script import ComprehensiveScraper
+
+    scraper = ComprehensiveScraper()
+    scraper.config.INPUT_JSON = input_path
+    scraper.config.OUTPUT_JSON = os.path.join(workdir, f'{case}.json')
+    scraper.config.OUTPUT_REPORT = os.path.join(workdir, f'{case}.html')
+    scraper.config.METRICS_PATH = None
+
+    start = time.perf_counter()
+    aggregates = scraper.run(count=count)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'case': case,
+        'seconds': round(elapsed, 4),
+        'records': aggregates['total'],
+        'records_per_sec': round(aggregates['total'] / elapsed, 2),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'stages': stage_breakdown(scraper.metrics)
+    }
+
+
+def run_isolated(func, *args) -> dict:
+    """Run one case in a fresh interpreter so peak RSS and caches are its own"""
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Cases whose throughput fell more than tolerance below the baseline"""
+    previous = {r['case']: r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get(result['case'])
+        if not before or not before['records_per_sec']:
+            continue
+        change = result['records_per_sec'] / before['records_per_sec'] - 1
+        result['change_vs_baseline'] = round(change, 4)
+        if change < -tolerance:
+            regressions.append(result['case'])
+    return regressions
+
+
+def print_result(result: dict):
+    stages = ', '.join(f"{stage} {seconds:.3f}s" for stage, seconds in
+                       sorted(result['stages'].items(), key=lambda item: -item[1])[:5])
+    change = result.get('change_vs_baseline')
+    change = f"  ({change:+.1%} vs baseline)" if change is not None else ''
+    print(f"{result['case']:<28} {result['records_per_sec']:>12,.1f} rec/s  "
+          f"{result['peak_rss_mb']:>8.1f} MB peak{change}")
+    print(f"{'':<28} {stages}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tender-sizes', default='10,100,1000,10000',
+                        help='containers per synthetic portal page')
+    parser.add_argument('--company-scales', default='1,10,100',
+                        help='multiples of the company dataset to enrich')
+    parser.add_argument('--fixtures', default=None, help='directory of saved portal pages to replay')
+    parser.add_argument('--html-parser', default=None, help='tree builder (default: fastest installed)')
+    parser.add_argument('--full-tree', action='store_true', help='build whole pages instead of targeted parsing')
+    parser.add_argument('--min-seconds', type=float, default=2.0,
+                        help='minimum time spent replaying each page')
+    parser.add_argument('--save-baseline', default=None, help='write results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='compare against a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='allowed records/sec drop before a case counts as a regression')
+    args = parser.parse_args()
+
+    with open(TENDERS_JSON, 'r', encoding='utf-8') as f:
+        tenders = json.load(f)
+
+    settings = {'html_parser': args.html_parser, 'targeted_parse': not args.full_tree}
+    results = []
+    for size in filter(None, args.tender_sizes.split(',')):
+        content = render_page(tenders, int(size))
+        results.append(run_isolated(bench_tender_page, f'tender_page_{size}', content, args.min_seconds, settings))
+    if args.fixtures:
+        for name, content in fixture_pages(args.fixtures):
+            results.append(run_isolated(bench_tender_page, f'fixture_{name}', content, args.min_seconds, settings))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in filter(None, args.company_scales.split(',')):
+            input_path = os.path.join(workdir, f'companies_x{scale}.ndjson')
+            count = 0
+            with open(input_path, 'w', encoding='utf-8') as f:
+                for record in company_records(int(scale)):
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    count += 1
+            results.append(run_isolated(bench_companies, f'companies_x{scale}', input_path, count, workdir))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    print(f"{'case':<28} {'throughput':>18}  {'memory':>13}")
+    for result in results:
+        print_result(result)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'cpus': os.cpu_count(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Compare whole-word keyword matching with the old substring matching.
+
+Runs TenderScraper's keyword tables over tender text both ways and lists,
+per table and keyword, the matches the word matcher loses (substring hits
+it no longer finds) and the ones it fixes or adds. Stem keywords ('ship*')
+are compared as the plain substring 'ship'. Review the lost matches after
+changing the tables or the tokenizer: each should be a false positive of
+the substring matcher, such as 'port' inside 'airport'.
+
+    python benchmarks/compare_matching.py [tendors.json ...] [--text "..."] [--examples 3]
+"""
+import os
+import sys
+import argparse
+from typing import Dict, List, Set, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SCRAPER_DIR)
+
+from streaming_io import iter_records  # noqa: E402
+from tendors_script import TenderScraper  # noqa: E402
+
+Hit = Tuple[str, str, str]
+
+
+def substring_hits(taxonomy: Dict[str, Dict[str, List[str]]], text: str) -> Set[Hit]:
+    """What the pre-automaton scraper matched: keyword anywhere in the lowercased text"""
+    text_lower = text.lower()
+    return {
+        (table, category, keyword)
+        for table, categories in taxonomy.items()
+        for category, keywords in categories.items()
+        for keyword in keywords
+        if keyword.rstrip('*') in text_lower
+    }
+
+
+def word_hits(scraper: TenderScraper, text: str) -> Set[Hit]:
+    return {
+        (table, category, keyword)
+        for table, categories in scraper.match_keywords(text).items()
+        for category, keywords in categories.items()
+        for keyword in keywords
+    }
+
+
+def record_text(record: Dict) -> str:
+    return f"{record.get('title', '')} {record.get('description', '')}"
+
+
+def compare(scraper: TenderScraper, texts: List[str]) -> Tuple[Dict[Hit, List[str]], Dict[Hit, List[str]]]:
+    """(lost, gained): texts per keyword that only the substring or only the word matcher hit"""
+    taxonomy = scraper.taxonomy()
+    lost, gained = {}, {}
+    for text in texts:
+        old, new = substring_hits(taxonomy, text), word_hits(scraper, text)
+        for hit in old - new:
+            lost.setdefault(hit, []).append(text)
+        for hit in new - old:
+            gained.setdefault(hit, []).append(text)
+    return lost, gained
+
+
+def report(title: str, hits: Dict[Hit, List[str]], examples: int):
+    print(f"{title}: {sum(len(texts) for texts in hits.values())} in {len(hits)} keywords")
+    for (table, category, keyword), texts in sorted(hits.items(), key=lambda item: -len(item[1])):
+        print(f"  {table}/{category} '{keyword}': {len(texts)}")
+        for text in texts[:examples]:
+            print(f"      {text[:120]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='*', default=[os.path.join(SCRAPER_DIR, 'tendors.json')],
+                        help='tender records (JSON array or NDJSON) to take title and description from')
+    parser.add_argument('--text', action='append', default=[], help='extra text to compare, repeatable')
+    parser.add_argument('--examples', type=int, default=3, help='texts shown per keyword')
+    args = parser.parse_args()
+
+    texts = list(args.text)
+    for path in args.inputs:
+        texts.extend(record_text(record) for record in iter_records(path))
+
+    lost, gained = compare(TenderScraper(), texts)
+    print(f"Compared {len(texts)} texts")
+    report("Lost (substring only)", lost, args.examples)
+    report("Gained (word matcher only)", gained, args.examples)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""Local stand-in for the tender portals, for load-testing the fetch layer.
+
+Serves paginated tender listings at /portal/<id>/tenders?page=N, rendered
+from tendors.json, with configurable latency, 5xx error rate, 429 rate
+(with Retry-After), gzip and ETag/If-None-Match revalidation.
+
+Every virtual host gets its own loopback address (127.0.x.y on the same
+port), so the scraper's per-host rate limits and slots apply to each
+portal the way they do in production. Linux routes all of 127/8 to the
+loopback interface; on other systems use --hosts 1.
+
+    python benchmarks/portal_server.py --portals 200 --latency 0.2 --error-rate 0.02 \\
+        --throttle-rate 0.05 --write-portals /tmp/portals.json
+"""
+import os
+import sys
+import gzip
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TENDERS_JSON = os.path.join(os.path.dirname(BENCH_DIR), 'tendors.json')
+
+PAGE_TEMPLATE = (
+    '<html><head><title>{name} - Active Tenders</title></head><body>'
+    '<div class="header"><h1>{name}</h1></div>'
+    '<table class="listing">{rows}</table>'
+    '<div class="pagination">{pager}</div></body></html>'
+)
+ROW_TEMPLATE = (
+    '<tr class="tender-row"><td><a href="/portal/{portal}/tender/{page}-{n}">{title}</a></td>'
+    '<td><p>{description} Ref: {portal}/{page}/{n}</p></td></tr>'
+)
+
+# SiteExtractor declaration for the markup above
+SITE_SELECTORS = {
+    'container': 'tr.tender-row',
+    'fields': {'title': 'td > a', 'description': 'td > p', 'link': 'td > a'},
+    'next_page': 'a[rel~=next]',
+    'parse_only': ['table']
+}
+
+
+class PortalSimulator:
+    """Request handling for the virtual portals, independent of the HTTP server"""
+
+    def __init__(self, tenders: List[Dict], pages: int = 5, per_page: int = 10,
+                 latency: float = 0.05, jitter: float = 0.5, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 1.0,
+                 gzip_enabled: bool = True, etags: bool = True, seed: int = 0):
+        self.tenders = tenders
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.gzip_enabled = gzip_enabled
+        self.etags = etags
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.rendered: Dict[Tuple[int, int], Tuple[bytes, bytes, str]] = {}
+        self.requests: Dict[int, int] = {}
+
+    def delay(self) -> float:
+        if self.latency <= 0:
+            return 0.0
+        with self.lock:
+            return self.rng.lognormvariate(math.log(self.latency), self.jitter)
+
+    def page(self, portal: int, page: int) -> Tuple[bytes, bytes, str]:
+        """(body, gzipped body, ETag) for a listing page, rendered once"""
+        key = (portal, page)
+        with self.lock:
+            cached = self.rendered.get(key)
+        if cached:
+            return cached
+        rows = []
+        for n in range(self.per_page):
+            tender = self.tenders[(portal * self.pages * self.per_page + page * self.per_page + n) % len(self.tenders)]
+            rows.append(ROW_TEMPLATE.format(
+                portal=portal, page=page, n=n,
+                title=tender['title'], description=tender['description']
+            ))
+        pager = []
+        if page > 1:
+            pager.append(f'<a class="prev" rel="prev" href="/portal/{portal}/tenders?page={page - 1}">Previous</a>')
+        if page < self.pages:
+            pager.append(f'<a class="next" rel="next" href="/portal/{portal}/tenders?page={page + 1}">Next</a>')
+        body = PAGE_TEMPLATE.format(
+            name=f"Virtual Portal {portal}", rows=''.join(rows), pager=' '.join(pager)
+        ).encode('utf-8')
+        rendered = (body, gzip.compress(body), '"' + hashlib.sha1(body).hexdigest() + '"')
+        with self.lock:
+            self.rendered[key] = rendered
+        return rendered
+
+    def respond(self, path: str, headers) -> Tuple[int, Dict[str, str], bytes]:
+        parsed = urlparse(path)
+        parts = parsed.path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'portal' or parts[2] != 'tenders' or not parts[1].isdigit():
+            return self._count(404), {'Content-Type': 'text/plain'}, b'not found'
+        portal = int(parts[1])
+        try:
+            page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+        except ValueError:
+            page = 0
+        if not 1 <= page <= self.pages:
+            return self._count(404), {'Content-Type': 'text/plain'}, b'no such page'
+
+        with self.lock:
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return self._count(429), {'Retry-After': f"{self.retry_after:g}", 'Content-Type': 'text/plain'}, b'slow down'
+        if roll < self.throttle_rate + self.error_rate:
+            return self._count(500), {'Content-Type': 'text/plain'}, b'internal error'
+
+        body, gzipped, etag = self.page(portal, page)
+        response_headers = {'Content-Type': 'text/html; charset=utf-8'}
+        if self.etags:
+            response_headers['ETag'] = etag
+            if headers.get('If-None-Match') == etag:
+                return self._count(304), response_headers, b''
+        if self.gzip_enabled and 'gzip' in headers.get('Accept-Encoding', ''):
+            response_headers['Content-Encoding'] = 'gzip'
+            body = gzipped
+        return self._count(200), response_headers, body
+
+    def _count(self, status: int) -> int:
+        with self.lock:
+            self.requests[status] = self.requests.get(status, 0) + 1
+        return status
+
+
+class PortalRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        simulator = self.server.simulator
+        status, headers, body = simulator.respond(self.path, self.headers)
+        time.sleep(simulator.delay())
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def portal_hosts(count: int) -> List[str]:
+    """Distinct loopback addresses, 127.0.0.1 first"""
+    return [f"127.0.{i // 254}.{i % 254 + 1}" for i in range(count)]
+
+
+def serve(simulator: PortalSimulator, hosts: List[str], port: int = 0) -> Tuple[List[ThreadingHTTPServer], int]:
+    """Start one threaded server per loopback host, all on the same port"""
+    servers = []
+    for host in hosts:
+        server = ThreadingHTTPServer((host, port), PortalRequestHandler)
+        server.daemon_threads = True
+        server.simulator = simulator
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers, port
+
+
+def portal_sites(hosts: List[str], port: int, portals: int) -> List[Dict]:
+    """Portal list in the shape scrape_all_websites expects, spread over the hosts"""
+    return [
+        {
+            'Portal Name': f"Virtual Portal {i}",
+            'Website URL': f"http://{hosts[i % len(hosts)]}:{port}/portal/{i}/tenders"
+        }
+        for i in range(portals)
+    ]
+
+
+def load_tenders() -> List[Dict]:
+    with open(TENDERS_JSON, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--portals', type=int, default=200)
+    parser.add_argument('--hosts', type=int, default=None, help='loopback hosts to spread portals over (default: one per portal)')
+    parser.add_argument('--pages', type=int, default=5, help='listing pages per portal')
+    parser.add_argument('--per-page', type=int, default=10, help='tenders per listing page')
+    parser.add_argument('--latency', type=float, default=0.05, help='median response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.5, help='lognormal sigma of the delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of 429 responses')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--no-gzip', action='store_true')
+    parser.add_argument('--no-etags', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def simulator_from_args(args: argparse.Namespace) -> PortalSimulator:
+    return PortalSimulator(
+        load_tenders(), pages=args.pages, per_page=args.per_page,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+        gzip_enabled=not args.no_gzip, etags=not args.no_etags, seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--write-portals', default=None, help='write the portal list as JSON to this path')
+    args = parser.parse_args()
+
+    hosts = portal_hosts(args.hosts or args.portals)
+    servers, port = serve(simulator_from_args(args), hosts, args.port)
+    sites = portal_sites(hosts, port, args.portals)
+    if args.write_portals:
+        with open(args.write_portals, 'w', encoding='utf-8') as f:
+            json.dump(sites, f, indent=2)
+    print(f"Serving {args.portals} portals on {len(hosts)} hosts, port {port}. Ctrl-C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import json
+import time
+import heapq
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_WEIGHTS = {'high': 1.0, 'medium': 0.6, 'low': 0.3}
+
+# Staleness is measured in freshness windows and capped so a company that
+# hasn't been crawled for months can't starve everything else
+MAX_STALENESS = 3.0
+
+# Page budgets grow by this fraction (at least one page) over what the last
+# crawl used, so a site that was cut short or has grown can recover
+PAGE_HEADROOM = 0.5
+
+
+def record_fingerprint(record: Dict) -> str:
+    """Hash of the crawled content that matters for lead scoring"""
+    content = {
+        'projects': sorted(p['project_name'] for p in record.get('projects', [])),
+        'signals': sorted(record.get('signals', [])),
+        'keywords': sorted(record.get('keywords_matched', []))
+    }
+    return hashlib.md5(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+class CrawlFrontier:
+    """Persistent crawl frontier ordering companies by expected value of a recrawl
+
+    score = priority weight * (0.5 + last overall score) * staleness * change rate
+
+    staleness is time since the last crawl in units of freshness_hours, and
+    change rate is the smoothed fraction of past crawls that found changed
+    content. Companies never crawled before get maximum staleness and a
+    change rate of 1, so new entries are crawled first.
+    """
+
+    def __init__(self, db_path: str, freshness_hours: float = 24):
+        self.db_path = db_path
+        self.freshness_hours = freshness_hours
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS frontier ('
+            'website TEXT PRIMARY KEY, name TEXT, priority TEXT, '
+            'last_crawled REAL, last_overall_score REAL, last_pages INTEGER, '
+            'crawl_count INTEGER DEFAULT 0, change_count INTEGER DEFAULT 0, '
+            'content_hash TEXT)'
+        )
+        self.conn.commit()
+
+    def sync(self, companies: List[Dict]):
+        """Add new companies and refresh names and priorities from the dataset"""
+        self.conn.executemany(
+            'INSERT INTO frontier (website, name, priority) VALUES (?, ?, ?) '
+            'ON CONFLICT(website) DO UPDATE SET name = excluded.name, priority = excluded.priority',
+            [(c['website'], c['name'], c.get('priority', 'low')) for c in companies]
+        )
+        self.conn.commit()
+
+    def score(self, row: Tuple, now: float) -> float:
+        _, priority, last_crawled, last_score, crawl_count, change_count = row
+        weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS['low'])
+        if last_crawled is None:
+            return weight * (0.5 + 0.5) * MAX_STALENESS
+        staleness = min((now - last_crawled) / 3600 / self.freshness_hours, MAX_STALENESS)
+        change_rate = (change_count + 1) / (crawl_count + 2)
+        return weight * (0.5 + (last_score or 0.5)) * staleness * change_rate
+
+    def schedule(self, request_budget: int, max_pages: int,
+                 websites: Optional[List[str]] = None) -> List[Tuple[str, int]]:
+        """Pick (website, page budget) pairs, best score first, until the budget is spent
+
+        A company's page budget counts HTTP requests, retries included. Each
+        gets the requests it made last time plus some headroom (or max_pages
+        if it has never been crawled), so cheap sites don't hold back budget
+        while sites that grew or were cut short can catch up.
+        """
+        now = time.time()
+        rows = self.conn.execute(
+            'SELECT website, priority, last_crawled, last_overall_score, crawl_count, change_count '
+            'FROM frontier'
+        ).fetchall()
+        pages_used = dict(self.conn.execute('SELECT website, last_pages FROM frontier').fetchall())
+        allowed = set(websites) if websites is not None else None
+
+        heap = [(-self.score(row, now), row[0]) for row in rows if allowed is None or row[0] in allowed]
+        heapq.heapify(heap)
+
+        plan = []
+        remaining = request_budget
+        while heap and remaining > 0:
+            neg_score, website = heapq.heappop(heap)
+            if -neg_score <= 0:
+                break
+            used = pages_used.get(website)
+            estimate = used + max(1, int(used * PAGE_HEADROOM)) if used else max_pages
+            pages = min(estimate, max_pages, remaining)
+            plan.append((website, pages))
+            remaining -= pages
+        logger.info(f"Scheduled {len(plan)} of {len(heap) + len(plan)} companies "
+                    f"within a budget of {request_budget} requests")
+        return plan
+
+    def record(self, website: str, overall_score: float, pages: int, content_hash: str):
+        """Store the outcome of a crawl and whether the content changed
+
+        pages is the number of HTTP requests the crawl made.
+        """
+        row = self.conn.execute('SELECT content_hash FROM frontier WHERE website = ?', (website,)).fetchone()
+        changed = 1 if row is None or row[0] != content_hash else 0
+        self.conn.execute(
+            'UPDATE frontier SET last_crawled = ?, last_overall_score = ?, last_pages = ?, '
+            'crawl_count = crawl_count + 1, change_count = change_count + ?, content_hash = ? '
+            'WHERE website = ?',
+            (time.time(), overall_score, pages, changed, content_hash, website)
+        )
+        self.conn.commit()
+
+    def record_failure(self, website: str):
+        """Count a failed crawl as an unchanged one so dead sites drift down the queue
+
+        last_pages is left alone so one transient failure doesn't shrink the
+        site's page budget.
+        """
+        self.conn.execute(
+            'UPDATE frontier SET last_crawled = ?, crawl_count = crawl_count + 1 '
+            'WHERE website = ?',
+            (time.time(), website)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,86 @@
+import re
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Inline scripts, styles and comments often carry per-request tokens and
+# timestamps, so they are dropped before hashing
+VOLATILE_MARKUP = re.compile(rb'<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->', re.I | re.S)
+WHITESPACE = re.compile(rb'\s+')
+
+
+def content_fingerprint(body: bytes) -> str:
+    """Hash of the page body with volatile markup and whitespace normalized away"""
+    normalized = WHITESPACE.sub(b' ', VOLATILE_MARKUP.sub(b'', body)).strip()
+    return hashlib.sha256(normalized).hexdigest()
+
+
+class FingerprintStore:
+    """Persistent URL -> (content hash, extracted tenders, pager links) map backed by SQLite
+
+    Pager links are kept with the tenders so pagination can carry on from a
+    page that was never parsed; NULL means they weren't collected.
+    """
+
+    def __init__(self, db_path: str, taxonomy_version: str = ''):
+        self.db_path = db_path
+        self.taxonomy_version = taxonomy_version
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS fingerprints ('
+            'url TEXT PRIMARY KEY, content_hash TEXT NOT NULL, '
+            'taxonomy_version TEXT NOT NULL, tenders TEXT NOT NULL, next_urls TEXT)'
+        )
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(fingerprints)')}
+        if 'next_urls' not in columns:
+            self.conn.execute('ALTER TABLE fingerprints ADD COLUMN next_urls TEXT')
+        self.conn.commit()
+
+    def lookup(self, url: str, content_hash: str) -> Optional[List[Dict]]:
+        """Cached tenders if the body and keyword tables match the last run"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT content_hash, taxonomy_version, tenders FROM fingerprints WHERE url = ?',
+                (url,)
+            ).fetchone()
+        if row and row[0] == content_hash and row[1] == self.taxonomy_version:
+            self.hits += 1
+            return json.loads(row[2])
+        self.misses += 1
+        return None
+
+    def page_links(self, url: str) -> Optional[List[str]]:
+        """Pager links stored with url's tenders, None when there are none for this taxonomy"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT taxonomy_version, next_urls FROM fingerprints WHERE url = ?', (url,)
+            ).fetchone()
+        if row and row[0] == self.taxonomy_version and row[1] is not None:
+            return json.loads(row[1])
+        return None
+
+    def store(self, url: str, content_hash: str, tenders: List[Dict],
+              next_urls: Optional[List[str]] = None):
+        try:
+            with self.lock:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO fingerprints (url, content_hash, taxonomy_version, tenders, next_urls) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (url, content_hash, self.taxonomy_version, json.dumps(tenders, ensure_ascii=False),
+                     json.dumps(next_urls) if next_urls is not None else None)
+                )
+                self.conn.commit()
+        except Exception as e:
+            logger.error(f"Error storing fingerprint for {url}: {e}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
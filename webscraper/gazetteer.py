@@ -0,0 +1,188 @@
+import re
+import csv
+import json
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+INDIAN_STATES = {
+    'Maharashtra', 'Gujarat', 'Tamil Nadu', 'Karnataka', 'Andhra Pradesh',
+    'Telangana', 'Uttar Pradesh', 'West Bengal', 'Rajasthan', 'Madhya Pradesh',
+    'Kerala', 'Odisha', 'Punjab', 'Haryana', 'Bihar', 'Assam', 'Jharkhand',
+    'Chhattisgarh', 'Uttarakhand', 'Himachal Pradesh', 'Goa', 'Delhi'
+}
+
+INDIAN_CITIES = {
+    'Mumbai', 'Delhi', 'Bangalore', 'Bengaluru', 'Hyderabad', 'Chennai', 'Kolkata',
+    'Pune', 'Ahmedabad', 'Surat', 'Jaipur', 'Lucknow', 'Kanpur', 'Nagpur',
+    'Visakhapatnam', 'Vizag', 'Vadodara', 'Baroda', 'Kochi', 'Cochin',
+    'Coimbatore', 'Bhopal', 'Indore', 'Nashik', 'Aurangabad', 'Rajahmundry',
+    'Kakinada', 'Mangalore', 'Mysore', 'Hazira', 'Jamnagar', 'Dahej',
+    'Mundra', 'Kandla', 'Panipat', 'Mathura', 'Numaligarh', 'Bongaigaon',
+    'Haldia', 'Paradip', 'Gurgaon', 'Gurugram', 'Noida', 'Faridabad',
+    'Ghaziabad', 'Manali', 'Nagothane', 'Silvassa', 'Vapi', 'Ankleshwar',
+    'Koyali', 'Vasai', 'Andheri', 'Navi Mumbai', 'Thane', 'Secunderabad'
+}
+
+CITY_STATE_MAP = {
+    'Mumbai': 'Maharashtra', 'Pune': 'Maharashtra', 'Nagpur': 'Maharashtra',
+    'Nashik': 'Maharashtra', 'Aurangabad': 'Maharashtra', 'Thane': 'Maharashtra',
+    'Navi Mumbai': 'Maharashtra', 'Andheri': 'Maharashtra', 'Vasai': 'Maharashtra',
+    'Delhi': 'Delhi', 'Gurgaon': 'Haryana', 'Gurugram': 'Haryana',
+    'Noida': 'Uttar Pradesh', 'Faridabad': 'Haryana', 'Ghaziabad': 'Uttar Pradesh',
+    'Bangalore': 'Karnataka', 'Bengaluru': 'Karnataka', 'Mysore': 'Karnataka',
+    'Mangalore': 'Karnataka', 'Hyderabad': 'Telangana', 'Secunderabad': 'Telangana',
+    'Chennai': 'Tamil Nadu', 'Coimbatore': 'Tamil Nadu', 'Manali': 'Tamil Nadu',
+    'Kolkata': 'West Bengal', 'Haldia': 'West Bengal',
+    'Ahmedabad': 'Gujarat', 'Surat': 'Gujarat', 'Vadodara': 'Gujarat',
+    'Baroda': 'Gujarat', 'Jamnagar': 'Gujarat', 'Hazira': 'Gujarat',
+    'Dahej': 'Gujarat', 'Ankleshwar': 'Gujarat', 'Vapi': 'Gujarat',
+    'Visakhapatnam': 'Andhra Pradesh', 'Vizag': 'Andhra Pradesh',
+    'Kakinada': 'Andhra Pradesh', 'Rajahmundry': 'Andhra Pradesh',
+    'Jaipur': 'Rajasthan', 'Bhopal': 'Madhya Pradesh', 'Indore': 'Madhya Pradesh',
+    'Kochi': 'Kerala', 'Cochin': 'Kerala', 'Panipat': 'Haryana',
+    'Mathura': 'Uttar Pradesh', 'Lucknow': 'Uttar Pradesh', 'Kanpur': 'Uttar Pradesh',
+    'Numaligarh': 'Assam', 'Bongaigaon': 'Assam', 'Paradip': 'Odisha',
+    'Mundra': 'Gujarat', 'Kandla': 'Gujarat', 'Koyali': 'Gujarat',
+    'Nagothane': 'Maharashtra', 'Silvassa': 'Dadra and Nagar Haveli'
+}
+
+# Alternate spellings and old names -> canonical name
+ALIASES = {
+    'Bengaluru': 'Bangalore', 'Vizag': 'Visakhapatnam', 'Baroda': 'Vadodara',
+    'Cochin': 'Kochi', 'Gurugram': 'Gurgaon', 'Bombay': 'Mumbai',
+    'Madras': 'Chennai', 'Calcutta': 'Kolkata', 'New Delhi': 'Delhi',
+    'Mysuru': 'Mysore', 'Mangaluru': 'Mangalore', 'Poona': 'Pune',
+    'Orissa': 'Odisha'
+}
+
+CONFIDENCE = {'city': 'high', 'state': 'medium'}
+
+
+def normalize_name(name: str) -> str:
+    return ' '.join(re.findall(r'[a-z0-9]+', name.lower()))
+
+
+class Gazetteer:
+    """Place-name index with a hash lookup and a single-pass text matcher
+
+    Every city, state and alias is one pattern in a KeywordMatcher, so finding
+    all places in a text costs one scan over its tokens however many places
+    the gazetteer holds.
+    """
+
+    def __init__(self):
+        self.places: Dict[str, Dict] = {}
+        self.names: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self._matcher = None
+
+    def add(self, name: str, state: Optional[str], country: str = 'India',
+            kind: str = 'city', aliases: Iterable[str] = ()):
+        """Register a place (and its aliases) under its canonical name"""
+        key = normalize_name(name)
+        self.places[key] = {
+            'name': name,
+            'city': name if kind == 'city' else None,
+            'state': state,
+            'country': country,
+            'kind': kind
+        }
+        for alias in [name, *aliases]:
+            self.names[normalize_name(alias)] = key
+        self._matcher = None
+
+    def load(self, path: str):
+        """Load extra places from JSON (list of objects) or CSV (header row)
+
+        Expected fields: name, state, country, kind ('city' or 'state') and
+        aliases (a list, or '|' separated in CSV).
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.lower().endswith('.csv'):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = json.load(f)
+        for row in rows:
+            aliases = row.get('aliases') or []
+            if isinstance(aliases, str):
+                aliases = [a for a in aliases.split('|') if a]
+            self.add(row['name'], row.get('state') or None, row.get('country') or 'India',
+                     row.get('kind') or 'city', aliases)
+        logger.info(f"Loaded {len(rows)} places from {path}")
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        with self.lock:
+            if self._matcher is None:
+                surface_forms = {}
+                for alias_key, key in self.names.items():
+                    surface_forms.setdefault(key, []).append(alias_key)
+                self._matcher = KeywordMatcher({'places': surface_forms})
+            return self._matcher
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        """Exact (normalized) lookup of a place or alias"""
+        key = self.names.get(normalize_name(name))
+        return self.result(key) if key else None
+
+    def result(self, key: str) -> Dict:
+        place = self.places[key]
+        return {
+            'city': place['city'],
+            'state': place['state'],
+            'country': place['country'],
+            'matched': place['name'],
+            'confidence': CONFIDENCE.get(place['kind'], 'low')
+        }
+
+    def find_all(self, text: str) -> List[Dict]:
+        """All places mentioned in text, in order of appearance
+
+        Overlapping hits keep the longest, so 'Navi Mumbai' wins over 'Mumbai'.
+        """
+        spans = []
+        for start, end, (_, key, _) in self.matcher.iter_matches(text):
+            # Drop earlier hits nested inside this one
+            while spans and spans[-1][0] >= start:
+                spans.pop()
+            if spans and spans[-1][1] >= start:
+                continue
+            spans.append((start, end, key))
+        return [self.result(key) for _, _, key in spans]
+
+    def find_first(self, text: str) -> Optional[Dict]:
+        """First place mentioned in text"""
+        places = self.find_all(text)
+        return places[0] if places else None
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_gazetteer() -> Gazetteer:
+    """Shared gazetteer built from the built-in Indian cities and states"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            gazetteer = Gazetteer()
+            for state in INDIAN_STATES:
+                gazetteer.add(state, state, kind='state')
+            aliases_of = {}
+            for alias, canonical in ALIASES.items():
+                aliases_of.setdefault(canonical, []).append(alias)
+            for city in INDIAN_CITIES | set(CITY_STATE_MAP):
+                if city in ALIASES:
+                    continue
+                gazetteer.add(city, CITY_STATE_MAP.get(city), aliases=aliases_of.get(city, []))
+            # States with alternate names (Orissa -> Odisha)
+            for alias, canonical in ALIASES.items():
+                if canonical in INDIAN_STATES and canonical not in CITY_STATE_MAP:
+                    gazetteer.add(canonical, canonical, kind='state', aliases=aliases_of[canonical])
+            _default = gazetteer
+        return _default
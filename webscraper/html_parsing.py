@@ -0,0 +1,63 @@
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # beautifulsoup4 < 4.13 filters through SoupStrainer callables instead
+    ElementFilter = None
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup tree builders, fastest first; html.parser ships with Python
+PARSERS = ('lxml', 'html.parser')
+
+# keep(tag name, raw attributes) -> whether to build the tag and its subtree
+TagPredicate = Callable[[str, Dict], bool]
+
+
+@lru_cache(maxsize=None)
+def resolve_parser(name: Optional[str] = None) -> str:
+    """The tree builder to use: name when it is installed, else the fastest available"""
+    if name and builder_registry.lookup(name):
+        return name
+    fallback = next(parser for parser in PARSERS if builder_registry.lookup(parser))
+    if name:
+        logger.warning(f"HTML parser {name!r} is not installed, falling back to {fallback!r}")
+    return fallback
+
+
+if ElementFilter is not None:
+    class _TagFilter(ElementFilter):
+        """Builds only the top-level tags keep accepts; everything inside them is kept whole"""
+
+        def __init__(self, keep: TagPredicate):
+            super().__init__()
+            self.keep = keep
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return self.keep(name, attrs or {})
+
+        def allow_string_creation(self, string: str) -> bool:
+            # Only consulted for text outside every kept tag
+            return False
+
+
+def tag_filter(keep: TagPredicate):
+    """parse_only filter that builds just the subtrees rooted at tags keep accepts
+
+    The tokenizer still reads the whole document, but everything else is
+    dropped as it streams past instead of being built into the tree, which
+    is most of the time and nearly all of the memory on a large page.
+    """
+    if ElementFilter is None:
+        return SoupStrainer(keep)
+    return _TagFilter(keep)
+
+
+def make_soup(content, parser: Optional[str] = None, parse_only=None) -> BeautifulSoup:
+    """Parse markup with the resolved tree builder, optionally through a tag_filter"""
+    return BeautifulSoup(content, resolve_parser(parser), parse_only=parse_only)
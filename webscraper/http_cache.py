@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPCache:
+    """On-disk conditional-GET cache storing bodies, validators and extracted tenders
+
+    Stored tenders are tagged with the version of the extraction that built
+    them (TenderScraper.taxonomy_version), and only handed back for the same
+    version, so a 304 never brings back tenders classified by older rules.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Discarding unreadable HTTP cache index: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self._index_path())
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def _path(self, url: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, self._key(url) + suffix)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers for a conditional GET, empty if the URL isn't cached"""
+        with self.lock:
+            entry = self.index.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, response, tenders: Optional[List[Dict]] = None, version: str = ''):
+        """Cache a 200 response together with the tenders parsed from it by extraction version"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        try:
+            with open(self._path(url, '.body'), 'wb') as f:
+                f.write(response.content)
+            if tenders is not None:
+                with open(self._path(url, '.json'), 'w', encoding='utf-8') as f:
+                    json.dump(tenders, f, ensure_ascii=False)
+            with self.lock:
+                self.index[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'size': len(response.content),
+                    'version': version,
+                    'accessed': time.time()
+                }
+                self._evict()
+                self._save_index()
+        except Exception as e:
+            logger.error(f"Error caching {url}: {e}")
+
+    def get_tenders(self, url: str, version: str = '') -> Optional[List[Dict]]:
+        """Tenders extracted from the cached body, used when the server answers 304
+
+        None when nothing is cached or the tenders came from another extraction version.
+        """
+        with self.lock:
+            entry = self.index.get(url)
+            if not entry or entry.get('version', '') != version:
+                self.misses += 1
+                return None
+            entry['accessed'] = time.time()
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                tenders = json.load(f)
+            self.hits += 1
+            return tenders
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+
+    def get_body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._path(url, '.body'), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = sum(entry['size'] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]['accessed']):
+            if total <= self.max_bytes:
+                break
+            for suffix in ('.body', '.json'):
+                try:
+                    os.remove(self._path(url, suffix))
+                except FileNotFoundError:
+                    pass
+            total -= entry['size']
+            del self.index[url]
+
+    def save(self):
+        with self.lock:
+            self._save_index()
@@ -0,0 +1,141 @@
+import re
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+# Plurals that add -es rather than -s: 'classes', 'dishes', 'batches', 'boxes'
+ES_PLURALS = ('sses', 'shes', 'ches', 'xes', 'zes')
+
+
+def normalize_token(token: str) -> str:
+    """Fold plurals so 'vessels' matches 'vessel' and 'supplies' matches 'supply', but 'ms' stays 'ms'"""
+    if len(token) <= 3 or not token.endswith('s') or token.endswith('ss'):
+        return token
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if token.endswith(ES_PLURALS):
+        return token[:-2]
+    return token[:-1]
+
+
+def tokenize(text: str) -> List[str]:
+    return [normalize_token(token) for token in TOKEN.findall(text.lower())]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens for several keyword tables at once
+
+    Keywords only match on whole words, so 'ms' no longer fires inside
+    'systems' and 'port' no longer fires inside 'airport'. A single-word
+    keyword ending in '*' is a stem and matches any word starting with it,
+    so 'ship*' covers 'shipping' and 'shipyard'.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]):
+        self.tables = tables
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[str, str, str]]] = [[]]
+        # Position of each keyword across all tables, used to order results
+        self.rank: Dict[Tuple[str, str, str], int] = {}
+        self.length: Dict[Tuple[str, str, str], int] = {}
+        # Stem keywords, looked up per token by each stem length in use
+        self.stems: Dict[str, List[Tuple[str, str, str]]] = {}
+        self.stem_lengths: List[int] = []
+
+        for table, categories in tables.items():
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    output = (table, category, keyword)
+                    if keyword.endswith('*'):
+                        self._add_stem(keyword, output)
+                        continue
+                    tokens = tokenize(keyword)
+                    if not tokens:
+                        continue
+                    self.rank.setdefault(output, len(self.rank))
+                    self.length[output] = len(tokens)
+                    self._add(tokens, output)
+        self._build_failure_links()
+
+    def _add_stem(self, keyword: str, output: Tuple[str, str, str]):
+        stem = keyword[:-1].lower()
+        if not TOKEN.fullmatch(stem):
+            raise ValueError(f"Stem keywords must be a single word: {keyword!r}")
+        self.rank.setdefault(output, len(self.rank))
+        self.length[output] = 1
+        self.stems.setdefault(stem, []).append(output)
+        if len(stem) not in self.stem_lengths:
+            self.stem_lengths.append(len(stem))
+            self.stem_lengths.sort()
+
+    def _stem_hits(self, token: str) -> List[Tuple[str, str, str]]:
+        hits = []
+        for length in self.stem_lengths:
+            if length > len(token):
+                break
+            hits.extend(self.stems.get(token[:length], ()))
+        return hits
+
+    def _add(self, tokens: List[str], output: Tuple[str, str, str]):
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.outputs[state].append(output)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Tuple[str, str, str]]]:
+        """Yield (start token, end token, (table, category, keyword)) for every hit
+
+        Hits are produced in order of their end position.
+        """
+        state = 0
+        for position, token in enumerate(tokenize(text)):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for output in self.outputs[state]:
+                yield position - self.length[output] + 1, position, output
+            if self.stems:
+                for output in self._stem_hits(token):
+                    yield position, position, output
+
+    def match(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        """Return {table: {category: [keywords]}} for every keyword found in text
+
+        Categories and keywords keep the order of the input tables, so callers
+        that pick the first matching category get the same answer as a
+        linear scan over the table.
+        """
+        found = set()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            found.update(self.outputs[state])
+            if self.stems:
+                found.update(self._stem_hits(token))
+
+        hits = {table: {} for table in self.tables}
+        for table, category, keyword in sorted(found, key=self.rank.__getitem__):
+            hits[table].setdefault(category, []).append(keyword)
+        return hits
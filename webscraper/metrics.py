@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers a regex pass over one record up to a slow portal fetch
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: 'Histogram'):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        total = 0
+        for bound, n in zip([*map(str, self.buckets), '+Inf'], self.counts):
+            total += n
+            yield bound, total
+
+
+class Metrics:
+    """Counters, gauges and histograms for one run
+
+    Metric names are prefixed with namespace. stage() times a block in wall
+    and CPU seconds; fetch() records per-host latency, bytes and status
+    codes. Everything is in-process dictionaries behind one lock, so it is
+    cheap enough to leave on. write() exports Prometheus text format, or
+    JSON for .json paths.
+    """
+
+    def __init__(self, namespace: str, enabled: bool = True):
+        self.namespace = namespace
+        self.enabled = enabled
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+        # (cache, pid) -> (hits, misses), so snapshots from merged worker
+        # processes add up instead of overwriting each other
+        self.caches: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage in wall and CPU (this thread) seconds"""
+        if not self.enabled:
+            yield
+            return
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - wall, stage=name)
+            self.observe('stage_cpu_seconds', time.thread_time() - cpu, stage=name)
+
+    def fetch(self, host: str, seconds: float, nbytes: int, status: int):
+        self.observe('fetch_seconds', seconds, host=host)
+        self.inc('fetch_bytes_total', nbytes, host=host)
+        self.inc('fetch_responses_total', host=host, status=status)
+
+    def cache(self, name: str, hits: int, misses: int):
+        """Snapshot this process's hit/miss totals for a cache"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.caches[(name, os.getpid())] = (hits, misses)
+
+    def _cache_gauges(self) -> Dict[LabelKey, float]:
+        totals = {}
+        for (name, _), (hits, misses) in self.caches.items():
+            total_hits, total_misses = totals.get(name, (0, 0))
+            totals[name] = (total_hits + hits, total_misses + misses)
+        gauges = {}
+        for name, (hits, misses) in totals.items():
+            gauges[_key('cache_hits', {'cache': name})] = hits
+            gauges[_key('cache_misses', {'cache': name})] = misses
+            gauges[_key('cache_hit_ratio', {'cache': name})] = hits / (hits + misses) if hits + misses else 0.0
+        return gauges
+
+    def merge(self, other: 'Metrics'):
+        """Fold in metrics collected by another process"""
+        with self.lock:
+            for key, value in other.counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            self.gauges.update(other.gauges)
+            self.caches.update(other.caches)
+            for key, histogram in other.histograms.items():
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = histogram
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self.lock:
+            gauges = {**self.gauges, **self._cache_gauges()}
+            for kind, series in (('counter', self.counters), ('gauge', gauges)):
+                typed = set()
+                for (name, labels), value in sorted(series.items()):
+                    full_name = f"{self.namespace}_{name}"
+                    if full_name not in typed:
+                        lines.append(f"# TYPE {full_name} {kind}")
+                        typed.add(full_name)
+                    lines.append(f"{full_name}{_format_labels(labels)} {value}")
+            typed = set()
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                full_name = f"{self.namespace}_{name}"
+                if full_name not in typed:
+                    lines.append(f"# TYPE {full_name} histogram")
+                    typed.add(full_name)
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{full_name}_bucket{_format_labels(labels, ('le', bound))} {count}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> Dict:
+        def series(items):
+            return [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in sorted(items)]
+
+        with self.lock:
+            return {
+                'namespace': self.namespace,
+                'counters': series(self.counters.items()),
+                'gauges': series({**self.gauges, **self._cache_gauges()}.items()),
+                'histograms': [
+                    {
+                        'name': name,
+                        'labels': dict(labels),
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'buckets': dict(histogram.cumulative())
+                    }
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                ]
+            }
+
+    def write(self, path: str):
+        """Export atomically, as JSON for .json paths and Prometheus text otherwise"""
+        if path.lower().endswith('.json'):
+            content = json.dumps(self.to_dict(), indent=2)
+        else:
+            content = self.to_prometheus()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote metrics to {path}")
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate can be lowered and restored"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available, return seconds waited"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def block_for(self, seconds: float):
+        """Hold off all requests for the given number of seconds"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def slow_down(self, factor: float = 0.5, min_rate: float = 0.02):
+        with self.lock:
+            self.rate = max(self.rate * factor, min_rate)
+
+    def speed_up(self, step: float = 0.1):
+        with self.lock:
+            self.rate = min(self.rate + step * self.base_rate, self.base_rate)
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker with optional state persisted between runs
+
+    Once an open circuit's cooldown has passed it goes half-open: a single
+    probe request is let through and the rest are refused until the probe's
+    success or failure is recorded. A probe whose outcome is never recorded
+    stops blocking after probe_timeout seconds.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 6 * 3600,
+                 state_file: Optional[str] = None, probe_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state_file = state_file
+        self.probe_timeout = probe_timeout
+        self.lock = threading.Lock()
+        self.state = self._load()
+        # host -> start time of its half-open probe; not persisted
+        self.probes: Dict[str, float] = {}
+
+    def _load(self) -> Dict:
+        if not self.state_file:
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not load circuit breaker state: {e}")
+            return {}
+
+    def save(self):
+        if not self.state_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with self.lock:
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.state, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving circuit breaker state: {e}")
+
+    def allow(self, host: str) -> bool:
+        """Closed or half-open circuits allow a request, open ones don't"""
+        with self.lock:
+            entry = self.state.get(host)
+            if not entry or entry['failures'] < self.failure_threshold:
+                return True
+            now = time.time()
+            if now - entry['opened_at'] < self.cooldown:
+                return False
+            # Half-open: one probe at a time until its outcome is recorded
+            if host in self.probes and now - self.probes[host] < self.probe_timeout:
+                return False
+            self.probes[host] = now
+            return True
+
+    def record_success(self, host: str):
+        with self.lock:
+            self.state.pop(host, None)
+            self.probes.pop(host, None)
+
+    def record_failure(self, host: str):
+        with self.lock:
+            self.probes.pop(host, None)
+            entry = self.state.setdefault(host, {'failures': 0, 'opened_at': 0})
+            entry['failures'] += 1
+            if entry['failures'] >= self.failure_threshold:
+                entry['opened_at'] = time.time()
+                logger.warning(f"Circuit opened for {host} after {entry['failures']} consecutive failures")
+
+
+class HostRateLimiter:
+    """Per-host token buckets with adaptive throttling and a circuit breaker"""
+
+    def __init__(self, default_rate: float = 0.5, default_burst: int = 1,
+                 host_rates: Optional[Dict[str, float]] = None,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0,
+                 failure_threshold: int = 3, cooldown: float = 6 * 3600,
+                 state_file: Optional[str] = None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_rates = host_rates or {}
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.breaker = CircuitBreaker(failure_threshold, cooldown, state_file)
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self.lock:
+            if host not in self.buckets:
+                rate = self.host_rates.get(host, self.default_rate)
+                self.buckets[host] = TokenBucket(rate, self.default_burst)
+            return self.buckets[host]
+
+    def acquire(self, host: str) -> float:
+        return self.bucket(host).acquire()
+
+    def allow(self, host: str) -> bool:
+        return self.breaker.allow(host)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    def throttle(self, host: str, retry_after: Optional[str], attempt: int) -> float:
+        """Handle a 429/503: honour Retry-After, otherwise back off, and halve the rate"""
+        delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff_delay(attempt)
+        delay = min(delay, self.max_backoff)
+        bucket = self.bucket(host)
+        bucket.block_for(delay)
+        bucket.slow_down()
+        return delay
+
+    def record_success(self, host: str):
+        self.bucket(host).speed_up()
+        self.breaker.record_success(host)
+
+    def record_failure(self, host: str):
+        self.breaker.record_failure(host)
+
+    def save(self):
+        self.breaker.save()
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
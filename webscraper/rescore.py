@@ -0,0 +1,112 @@
+import os
+import logging
+import argparse
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from batch_scoring import score_tenders, score_companies
+from streaming_io import iter_records, StreamingJSONWriter
+from tendors_script import TenderScraper
+from website_script import Config, CompanyCrawler
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = ('urgency_score', 'confidence_score', 'overall_score', 'signal_strength')
+
+
+def batches(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def rescore_batch(records: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+    """Recompute scores in place from stored fields and return the records that changed
+
+    Tenders are scored from their stored deadline, product confidences and
+    signals. Crawled company records get their signal level, urgency and
+    confidence rebuilt from signals and keywords_matched; other company
+    records keep their urgency and confidence and are reweighted.
+    """
+    before = [tuple(r.get(field) for field in SCORE_FIELDS) for r in records]
+    tenders = [r for r in records if r.get('source_type') == 'tender']
+    companies = [r for r in records if r.get('source_type') != 'tender']
+
+    score_tenders(tenders, TenderScraper.URGENCY_WEIGHT, TenderScraper.CONFIDENCE_WEIGHT,
+                  TenderScraper.SIGNAL_WEIGHT, now=now)
+
+    reweighted = []
+    for company in companies:
+        if company.get('extraction_method') != CompanyCrawler.EXTRACTION_METHOD:
+            reweighted.append(company)
+            continue
+        level, urgency, confidence = CompanyCrawler.signal_scores(
+            company.get('signals', []), len(company.get('keywords_matched', []))
+        )
+        # Overall from the unrounded components, as CompanyCrawler.analyze does
+        overall = urgency * Config.URGENCY_WEIGHT + confidence * Config.CONFIDENCE_WEIGHT
+        company.update({
+            'signal_strength': level,
+            'urgency_score': round(urgency, 2),
+            'confidence_score': round(confidence, 2),
+            'overall_score': round(overall, 2)
+        })
+    score_companies(reweighted, Config.URGENCY_WEIGHT, Config.CONFIDENCE_WEIGHT)
+
+    return [r for r, old in zip(records, before) if tuple(r.get(field) for field in SCORE_FIELDS) != old]
+
+
+def rescore_file(path: str, output_path: str, apply: bool = False, batch_size: int = 5000) -> Dict:
+    """Stream stored leads from path and write the rescored ones to output_path as NDJSON
+
+    With apply=True the source file is also rewritten atomically with every
+    record's new scores (NDJSON for .ndjson/.jsonl paths, otherwise a JSON array).
+    """
+    stats = {'records': 0, 'changed': 0}
+    now = datetime.now()
+    rewrite = StreamingJSONWriter(path) if apply else None
+    try:
+        with StreamingJSONWriter(output_path) as out:
+            for batch in batches(iter_records(path), batch_size):
+                changed = rescore_batch(batch, now)
+                for record in changed:
+                    out.write(record)
+                if rewrite:
+                    for record in batch:
+                        rewrite.write(record)
+                stats['records'] += len(batch)
+                stats['changed'] += len(changed)
+    except Exception:
+        if rewrite:
+            rewrite.abort()
+        raise
+    if rewrite:
+        rewrite.close()
+
+    logger.info(f"Rescored {stats['records']} records from {path}: "
+                f"{stats['changed']} changed, written to {output_path}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute lead scores without refetching')
+    parser.add_argument('inputs', nargs='+', help='stored leads (JSON array or NDJSON)')
+    parser.add_argument('--output-dir', default=None,
+                        help='where to write <name>.rescored.ndjson (default: next to each input)')
+    parser.add_argument('--apply', action='store_true', help='also rewrite each input with the new scores')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        name = os.path.splitext(os.path.basename(path))[0] + '.rescored.ndjson'
+        output_path = os.path.join(args.output_dir or os.path.dirname(os.path.abspath(path)), name)
+        stats = rescore_file(path, output_path, apply=args.apply, batch_size=args.batch_size)
+        print(f"{path}: {stats['changed']} of {stats['records']} scores changed -> {output_path}")
+
+
+if __name__ == "__main__":
+    main()
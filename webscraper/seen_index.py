@@ -0,0 +1,91 @@
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+# Fields that identify what a tender says; scores and discovery_date drift
+# from run to run and must not make an unchanged tender look changed
+CONTENT_FIELDS = [
+    'company_name', 'source_url', 'title', 'description', 'deadline',
+    'estimated_value', 'tender_id', 'products_recommended', 'location'
+]
+
+
+def content_hash(tender: Dict) -> str:
+    content = {field: tender.get(field) for field in CONTENT_FIELDS}
+    return hashlib.md5(json.dumps(content, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+class SeenIndex:
+    """Persistent index of tenders already emitted, keyed by lead_id"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            'lead_id TEXT PRIMARY KEY, content_hash TEXT NOT NULL, '
+            'first_seen TEXT NOT NULL, last_seen TEXT NOT NULL)'
+        )
+        self.conn.commit()
+
+    def delta(self, tenders: List[Dict], record: bool = True) -> List[Dict]:
+        """Return only the tenders that are new or changed, recording them all as seen
+
+        Changed tenders keep the discovery_date of their first sighting so a
+        downstream upsert on lead_id doesn't reset it. With record=False
+        nothing is written; call record() once the delta is safely stored.
+        """
+        changed = []
+        with self.lock:
+            for tender in tenders:
+                row = self.conn.execute(
+                    'SELECT content_hash, first_seen FROM seen WHERE lead_id = ?',
+                    (tender['lead_id'],)
+                ).fetchone()
+                if row is None:
+                    changed.append(tender)
+                elif row[0] != content_hash(tender):
+                    tender['discovery_date'] = row[1]
+                    changed.append(tender)
+        logger.info(f"{len(changed)} of {len(tenders)} tenders are new or changed")
+        if record:
+            self.record(tenders)
+        return changed
+
+    def record(self, tenders: List[Dict]):
+        """Mark tenders as seen with their current content"""
+        now = datetime.now().isoformat()
+        with self.lock:
+            self.conn.executemany(
+                'INSERT INTO seen VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(lead_id) DO UPDATE SET content_hash = excluded.content_hash, '
+                'last_seen = excluded.last_seen',
+                [(tender['lead_id'], content_hash(tender), tender.get('discovery_date') or now, now)
+                 for tender in tenders]
+            )
+            self.conn.commit()
+
+    def known(self, lead_ids: Iterable[str]) -> Set[str]:
+        """The given lead_ids that are already in the index, recording nothing"""
+        lead_ids = list(lead_ids)
+        found = set()
+        with self.lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(lead_ids), 500):
+                chunk = lead_ids[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT lead_id FROM seen WHERE lead_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
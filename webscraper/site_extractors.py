@@ -0,0 +1,134 @@
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+from html_parsing import tag_filter
+
+logger = logging.getLogger(__name__)
+
+# Selectors a site can declare; all but container run inside one container
+FIELDS = ('title', 'description', 'link', 'deadline', 'value', 'tender_id', 'company')
+
+
+class SiteExtractor:
+    """Precompiled CSS selectors for one portal's listing markup
+
+    container selects each tender on a listing page and the field selectors
+    pick parts of it. Fields without a selector, or whose selector finds
+    nothing, fall back to the generic text heuristics. next_page selects the
+    pager link when the generic next-link detection gets it wrong, and
+    parse_only names the tags whose subtrees hold the listing, so the rest
+    of the page is never built.
+    """
+
+    def __init__(self, name: str, hosts: Iterable[str], container: str,
+                 fields: Optional[Dict[str, str]] = None, next_page: Optional[str] = None,
+                 parse_only: Optional[Iterable[str]] = None):
+        fields = fields or {}
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields for site {name}: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.hosts = [host.lower() for host in hosts]
+        self.spec = {
+            'name': name, 'hosts': self.hosts, 'container': container, 'fields': dict(fields),
+            'next_page': next_page, 'parse_only': sorted(parse_only) if parse_only else None
+        }
+        self.container = soupsieve.compile(container)
+        # Fields sharing a selector share one compiled pattern and one match
+        compiled = {selector: soupsieve.compile(selector) for selector in set(fields.values())}
+        self.fields = {field: compiled[selector] for field, selector in fields.items()}
+        self.next_page = soupsieve.compile(next_page) if next_page else None
+        self.parse_only = frozenset(parse_only or ())
+        self.tag_filter = tag_filter(self._keep) if self.parse_only else None
+
+    def _keep(self, name: str, attrs: Dict) -> bool:
+        return name in self.parse_only or (name in ('a', 'link') and 'href' in attrs)
+
+    def containers(self, soup: BeautifulSoup) -> List[Tag]:
+        return self.container.select(soup)
+
+    def extract(self, container: Tag) -> Dict[str, Optional[Tag]]:
+        """First element for each declared field inside container, None where nothing matches"""
+        matches = {}
+        elements = {}
+        for field, selector in self.fields.items():
+            if id(selector) not in matches:
+                matches[id(selector)] = selector.select_one(container)
+            elements[field] = matches[id(selector)]
+        return elements
+
+    @staticmethod
+    def text(elem: Optional[Tag]) -> Optional[str]:
+        if elem is None:
+            return None
+        return elem.get_text(' ', strip=True) or None
+
+    def next_links(self, soup: BeautifulSoup) -> List[str]:
+        if not self.next_page:
+            return []
+        return [elem['href'] for elem in self.next_page.select(soup) if elem.get('href')]
+
+
+class SiteRegistry:
+    """Site extractors keyed by host; subdomains use their parent's extractor"""
+
+    def __init__(self, extractors: Iterable[SiteExtractor] = ()):
+        self.sites: Dict[str, SiteExtractor] = {}
+        for extractor in extractors:
+            self.register(extractor)
+
+    def register(self, extractor: SiteExtractor):
+        for host in extractor.hosts:
+            self.sites[host] = extractor
+
+    def load(self, path: str):
+        """Load extractors from a JSON list of objects
+
+        Expected fields: name, hosts, container, fields (field -> selector),
+        and optionally next_page and parse_only.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        for row in rows:
+            self.register(SiteExtractor(
+                row['name'], row['hosts'], row['container'], row.get('fields'),
+                row.get('next_page'), row.get('parse_only')
+            ))
+        logger.info(f"Loaded {len(rows)} site extractors from {path}")
+
+    def lookup(self, url: str) -> Optional[SiteExtractor]:
+        """Extractor for url's host or the nearest parent domain"""
+        host = (urlparse(url).hostname or '').lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        while host:
+            extractor = self.sites.get(host)
+            if extractor:
+                return extractor
+            host = host.partition('.')[2]
+        return None
+
+    def specs(self) -> List[Dict]:
+        """Declarations of the registered extractors, each once"""
+        unique = {id(extractor): extractor for extractor in self.sites.values()}
+        return sorted((extractor.spec for extractor in unique.values()), key=lambda spec: spec['name'])
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def __getstate__(self):
+        # Compiled selectors and parse filters are rebuilt from the declarations
+        return {'specs': self.specs()}
+
+    def __setstate__(self, state):
+        self.sites = {}
+        for spec in state['specs']:
+            self.register(SiteExtractor(
+                spec['name'], spec['hosts'], spec['container'], spec['fields'],
+                spec['next_page'], spec['parse_only']
+            ))
@@ -0,0 +1,220 @@
+import os
+import json
+import logging
+from itertools import islice
+from typing import Dict, Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+CHUNK_SIZE = 1 << 16
+
+# What can follow an array element in valid JSON
+ELEMENT_END = frozenset(' \t\r\n,]')
+
+
+def _iter_json_array(f, chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """Decode the elements of a top-level JSON array one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Expected a JSON array')
+    pos = 1
+    while True:
+        # Skip separators, reading more when the buffer runs out
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ','):
+            pos += 1
+        if pos == len(buffer):
+            more = f.read(chunk_size)
+            if not more:
+                raise ValueError('Unterminated JSON array')
+            buffer, pos = more, 0
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # Element runs past the buffer
+            more = f.read(chunk_size)
+            if not more:
+                raise
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        if end == len(buffer) or buffer[end] not in ELEMENT_END:
+            # A number cut at the buffer end ('12' of '123', '1' of '1.5')
+            # decodes as a shorter one; decode again with more text
+            more = f.read(chunk_size)
+            if more:
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            if end < len(buffer):
+                raise ValueError(f"Unexpected {buffer[end]!r} after array element")
+        yield element
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def iter_records(path: str, offset: int = 0, count: Optional[int] = None) -> Iterator[Dict]:
+    """Records from a JSON array file or an NDJSON file, one at a time
+    
+    offset and count select a shard. NDJSON lines before the shard are
+    skipped without being decoded.
+    """
+    stop = None if count is None else offset + count
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            yield from islice(_iter_json_array(f), offset, stop)
+            return
+        index = 0
+        for line in f:
+            if not line.strip():
+                continue
+            if stop is not None and index >= stop:
+                return
+            if index >= offset:
+                yield json.loads(line)
+            index += 1
+
+
+def count_records(path: str) -> int:
+    """Number of records in a JSON array or NDJSON file"""
+    return sum(1 for _ in iter_records(path))
+
+
+class StreamingJSONWriter:
+    """Write records one at a time as a JSON array (or NDJSON for .ndjson/.jsonl paths)
+    
+    Output goes to <path>.partial and is renamed into place on close, so a
+    failed run never leaves a truncated file behind. Array output is laid
+    out the same as json.dump(records, f, indent=2).
+    """
+    
+    def __init__(self, path: str, indent: Optional[int] = 2):
+        self.path = path
+        self.partial_path = path + '.partial'
+        self.indent = indent
+        self.ndjson = path.lower().endswith(('.ndjson', '.jsonl'))
+        self.count = 0
+        self.f = open(self.partial_path, 'w', encoding='utf-8')
+        if not self.ndjson:
+            self.f.write('[')
+    
+    def write(self, record: Dict):
+        if self.ndjson:
+            self.f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            text = json.dumps(record, indent=self.indent, ensure_ascii=False)
+            if self.indent is not None:
+                pad = ' ' * self.indent
+                text = '\n' + pad + text.replace('\n', '\n' + pad)
+            self.f.write((',' if self.count else '') + text)
+        self.count += 1
+    
+    def close(self):
+        """Finish the file and move it into place"""
+        if not self.ndjson:
+            self.f.write('\n]' if self.count and self.indent is not None else ']')
+        self.f.close()
+        os.replace(self.partial_path, self.path)
+    
+    def abort(self):
+        """Discard the partial output"""
+        self.f.close()
+        os.remove(self.partial_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class NDJSONCheckpointWriter:
+    """Append-only NDJSON writer with per-portal checkpoints and crash resume
+
+    Records go to <path>.partial one line at a time. After each portal the
+    data file is fsynced and its byte offset is appended to <path>.progress,
+    so a restarted run can truncate any half-written portal and skip the
+    portals that already completed. finalize() renames the data file into
+    place atomically.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 100):
+        self.path = path
+        self.partial_path = path + '.partial'
+        self.progress_path = path + '.progress'
+        self.fsync_every = fsync_every
+        self.completed = self._load_progress()
+        self.count = 0
+        self.pending = 0
+        self.data = open(self.partial_path, 'ab')
+        self.progress = open(self.progress_path, 'a', encoding='utf-8')
+
+    def _load_progress(self) -> Set[str]:
+        """Read completed portals and drop records from a portal that didn't finish"""
+        completed = set()
+        offset = 0
+        if os.path.exists(self.progress_path) and os.path.exists(self.partial_path):
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn final line from a crash
+                    completed.add(entry['portal'])
+                    offset = entry['offset']
+        if os.path.exists(self.partial_path):
+            with open(self.partial_path, 'r+b') as f:
+                f.truncate(offset)
+        if completed:
+            logger.info(f"Resuming: {len(completed)} portals already written to {self.partial_path}")
+        else:
+            # Stale progress from an older run without its data file
+            open(self.progress_path, 'w').close()
+        return completed
+
+    def is_done(self, portal: str) -> bool:
+        return portal in self.completed
+
+    def write(self, record: Dict):
+        self.data.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.count += 1
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            self._sync()
+
+    def _sync(self):
+        self.data.flush()
+        os.fsync(self.data.fileno())
+        self.pending = 0
+
+    def mark_portal_done(self, portal: str):
+        """Make the portal's records durable, then checkpoint it"""
+        self._sync()
+        self.progress.write(json.dumps({'portal': portal, 'offset': self.data.tell()}) + '\n')
+        self.progress.flush()
+        os.fsync(self.progress.fileno())
+        self.completed.add(portal)
+
+    def finalize(self):
+        """Atomically publish the NDJSON file and drop the checkpoint"""
+        self._sync()
+        self.data.close()
+        self.progress.close()
+        os.replace(self.partial_path, self.path)
+        os.remove(self.progress_path)
+        logger.info(f"Saved {self.count} tenders this run to {self.path}")
+
+    def close(self):
+        """Close without publishing, leaving the checkpoint for a later resume"""
+        self.data.close()
+        self.progress.close()
@@ -3,12 +3,27 @@ from bs4 import BeautifulSoup
 import json
 import hashlib
 import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Callable, List, Dict, Optional, Set, Tuple
 import time
-import random
-from urllib.parse import urljoin, urlparse
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
 import logging
+from functools import lru_cache
+
+from rate_limit import HostRateLimiter
+from http_cache import HTTPCache
+from fingerprints import FingerprintStore, content_fingerprint
+from keyword_matcher import KeywordMatcher
+from seen_index import SeenIndex
+from streaming_io import NDJSONCheckpointWriter
+from gazetteer import default_gazetteer
+from batch_scoring import score_tenders, tender_summary
+from metrics import Metrics
+from html_parsing import make_soup, resolve_parser, tag_filter
+from site_extractors import SiteExtractor, SiteRegistry
 
 # Setup logging
 logging.basicConfig(
@@ -18,10 +33,156 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class ExtractionPatterns:
+    """Compiled regexes shared by every TenderScraper, built once at import
+    
+    Patterns start with a plain character class where possible, which lets
+    the regex engine skip ahead to candidate positions instead of trying
+    every alternative at every offset.
+    """
+    
+    # One scan for all three date formats; the named group that matched tells
+    # the format (the shared leading digit sits outside the groups, so use
+    # group(0) for the full date string)
+    DEADLINE = re.compile(
+        r'[0-9](?:'
+        r'(?P<dmy>\d?[-/.]\d{1,2}[-/.]\d{4})'
+        r'|(?P<ymd>\d{3}[-/.]\d{2}[-/.]\d{2})'
+        r'|(?P<d_mon_y>\d?(?i:st|nd|rd|th)?[-/.\s]\s*'
+        r'(?i:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)\.?[-/.,\s]\s*\d{4})'
+        r')'
+    )
+    
+    DATE_PARTS = re.compile(r'\d+|[A-Za-z]+')
+    
+    # Wording that marks a date as the closing date rather than a
+    # publication or opening date
+    DEADLINE_CUE = re.compile(r'clos|last\s+date|due|deadline|bid\s+submission|submission\s+date|end\s+date', re.I)
+    # How far before a date its cue may start
+    DEADLINE_CUE_WINDOW = 40
+    
+    # ₹, INR, USD and $ amounts in one scan; CURRENCY_RANK orders the
+    # currencies when a text quotes more than one
+    VALUE = re.compile(r'(?P<currency>₹|INR|USD|\$)\s*(?P<amount>[\d,]+(?:\.\d{2})?)', re.I)
+    CURRENCY_RANK = {'₹': 0, 'INR': 1, 'USD': 2, '$': 3}
+    
+    # Cheap prefilter: the name patterns backtrack heavily and can only
+    # match when one of these suffixes is present
+    COMPANY_SUFFIX = re.compile(r'Ltd|Limited|Inc|Corporation|Pvt|Private')
+    
+    # Tried in order: an explicit "by/for/from <org>" beats a bare org name
+    COMPANY_NAME = [
+        re.compile(r'(?:by|for|from)\s+([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corporation|Pvt|Private))'),
+        re.compile(r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corporation|Pvt|Private))')
+    ]
+    
+    TENDER_ID = re.compile(r'(?:tender|ref|id)[:\s#]*([A-Z0-9-]+)', re.I)
+    
+    # Bare number in a value field picked out by a site selector
+    AMOUNT = re.compile(r'\d[\d,]*(?:\.\d+)?')
+    
+    CONTAINER_TAGS = ('div', 'tr', 'li')
+    # Parents that close rows and list items left without end tags
+    CONTAINER_PARENTS = ('table', 'thead', 'tbody', 'tfoot', 'ul', 'ol')
+    CONTAINER_CLASS = re.compile(r'tender|item|row', re.I)
+    
+    # Pager links: text, class, title or aria-label of a "next page" anchor
+    NEXT_LINK = re.compile(r'\bnext\b|^\s*(?:>|>>|\u00bb|\u203a)\s*$', re.I)
+    
+    # Query parameters that number listing pages; START_PARAMS count records from 0
+    PAGE_PARAMS = frozenset(['page', 'pg', 'p', 'pageno', 'page_no', 'pagenum', 'pagenumber', 'start', 'offset'])
+    START_PARAMS = frozenset(['start', 'offset'])
+
+
+MONTHS = {
+    month: number for number, month in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1
+    )
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_deadline(date_str: str) -> Optional[datetime]:
+    """Parse a date matched by ExtractionPatterns.DEADLINE
+    
+    Handles dd-mm-yyyy, yyyy-mm-dd and "12 Mar 2026" style dates with -, /, .
+    or space separators. Closing dates repeat across many listings, so results
+    are memoized per raw string.
+    """
+    parts = [
+        part for part in ExtractionPatterns.DATE_PARTS.findall(date_str)
+        if part.lower() not in ('st', 'nd', 'rd', 'th')
+    ]
+    if len(parts) != 3:
+        return None
+    
+    try:
+        if parts[1].isalpha():
+            day, month, year = int(parts[0]), MONTHS[parts[1][:3].lower()], int(parts[2])
+        elif len(parts[0]) == 4:
+            year, month, day = (int(part) for part in parts)
+        else:
+            # Indian portals write numeric dates day first
+            day, month, year = (int(part) for part in parts)
+        return datetime(year, month, day)
+    except (KeyError, ValueError):
+        return None
+
+
 class TenderScraper:
     """Main scraper class for tender websites"""
     
-    def __init__(self):
+    # Bump when extraction logic changes so fingerprinted results are rebuilt
+    EXTRACTION_VERSION = 9
+    
+    # Circuit breaker state for the default rate limiter, kept between runs so
+    # portals that stopped answering are skipped until their cooldown passes
+    CIRCUIT_STATE_FILE = '/mnt/user-data/outputs/circuit_breaker.json'
+    
+    # Portal selectors loaded when no registry is passed in; see SiteRegistry.load
+    SITE_EXTRACTORS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'site_extractors.json')
+    
+    # Overall score = urgency, product confidence and signal count, weighted
+    URGENCY_WEIGHT = 0.3
+    CONFIDENCE_WEIGHT = 0.5
+    SIGNAL_WEIGHT = 0.1
+    
+    def __init__(self, max_concurrency: int = 8, per_host_concurrency: int = 1,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 http_cache: Optional[HTTPCache] = None,
+                 fingerprint_db: Optional[str] = None,
+                 seen_index_db: Optional[str] = None,
+                 metrics: Optional[Metrics] = None,
+                 metrics_path: Optional[str] = None,
+                 request_timeout: float = 30, max_retries: int = 3,
+                 page_budget: int = 5, max_containers: int = 100,
+                 html_parser: Optional[str] = None, targeted_parse: bool = True,
+                 site_extractors: Optional[SiteRegistry] = None,
+                 site_extractors_path: Optional[str] = None):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        # Listing pages fetched per portal, including the first, and tender
+        # containers read per page
+        self.page_budget = max(1, page_budget)
+        self.max_containers = max_containers
+        # Tree builder (lxml when installed, else html.parser). Targeted
+        # parsing builds only tender containers and links, not the whole page
+        self.html_parser = resolve_parser(html_parser)
+        self.targeted_parse = targeted_parse
+        self.listing_filter = tag_filter(self._listing_tag) if targeted_parse else None
+        # Selectors for known portals, from site_extractors_path (default
+        # SITE_EXTRACTORS_JSON) when present; every other portal gets the
+        # generic heuristics
+        if site_extractors is None:
+            site_extractors = SiteRegistry()
+            path = site_extractors_path or self.SITE_EXTRACTORS_JSON
+            if os.path.exists(path):
+                site_extractors.load(path)
+        self.site_extractors = site_extractors
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or HostRateLimiter(state_file=self.CIRCUIT_STATE_FILE)
+        self.http_cache = http_cache
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -39,7 +200,7 @@ class TenderScraper:
             'Diesel': ['diesel', 'hsd', 'high speed diesel', 'automotive diesel'],
             'Petrol': ['petrol', 'gasoline', 'motor spirit', 'ms'],
             'Aviation Fuel': ['aviation fuel', 'jet fuel', 'atf', 'aviation turbine fuel'],
-            'Lubricants': ['lubricant', 'lube oil', 'engine oil', 'grease', 'hydraulic oil'],
+            'Lubricants': ['lubric*', 'lube oil', 'engine oil', 'grease', 'hydraulic oil'],
             'LPG': ['lpg', 'liquefied petroleum gas', 'cooking gas'],
             'CNG': ['cng', 'compressed natural gas'],
             'LNG': ['lng', 'liquefied natural gas'],
@@ -47,41 +208,110 @@ class TenderScraper:
         }
         
         self.signal_keywords = {
-            'procurement': ['tender', 'procurement', 'supply', 'contract', 'purchase', 'acquisition'],
-            'expansion': ['expansion', 'new facility', 'construction', 'development'],
-            'maintenance': ['maintenance', 'repair', 'service', 'amc'],
+            'procurement': ['tender', 'procur*', 'suppl*', 'contract*', 'purchas*', 'acquisition'],
+            'expansion': ['expan*', 'new facility', 'construct*', 'develop*'],
+            'maintenance': ['maintenance', 'repair*', 'servic*', 'amc'],
             'urgent': ['urgent', 'immediate', 'emergency', 'critical']
         }
+        
+        self.industry_keywords = {
+            'shipping': ['ship*', 'marine', 'vessel', 'port', 'maritime'],
+            'aviation': ['aviation', 'airport', 'aircraft', 'airline'],
+            'automotive': ['automotive', 'vehicle', 'car', 'truck'],
+            'manufacturing': ['manufactur*', 'factory', 'plant', 'industrial'],
+            'energy': ['power', 'energy', 'electricity', 'generator'],
+            'transport': ['transport*', 'logistics', 'fleet']
+        }
+        
+        self.facility_keywords = {
+            'port': ['port', 'harbor', 'jetty'],
+            'airport': ['airport', 'aerodrome'],
+            'warehouse': ['warehouse', 'depot', 'storage'],
+            'plant': ['plant', 'factory', 'manufacturing unit'],
+            'station': ['station', 'depot']
+        }
+        
+        # One automaton over every keyword table, matched once per record
+        self.matcher = KeywordMatcher(self.taxonomy())
+        
+        self.fingerprints = (
+            FingerprintStore(fingerprint_db, self.taxonomy_version()) if fingerprint_db else None
+        )
+        
+        # When set, runs only return tenders that are new or changed since the last run
+        self.seen_index = SeenIndex(seen_index_db) if seen_index_db else None
+        
+        # Stage timings, fetch stats and cache ratios, exported after each
+        # run when metrics_path is set (.json for JSON, else Prometheus text)
+        self.metrics = metrics or Metrics('tender_scraper')
+        self.metrics_path = metrics_path
+    
+    def taxonomy(self) -> Dict[str, Dict[str, List[str]]]:
+        """All keyword tables used for classification"""
+        return {
+            'products': self.product_keywords,
+            'signals': self.signal_keywords,
+            'industries': self.industry_keywords,
+            'facilities': self.facility_keywords
+        }
+    
+    def load_taxonomy(self, tables: Dict[str, Dict[str, List[str]]]):
+        """Replace the keyword tables and rebuild the matcher"""
+        self.product_keywords = tables['products']
+        self.signal_keywords = tables['signals']
+        self.industry_keywords = tables['industries']
+        self.facility_keywords = tables['facilities']
+        self.matcher = KeywordMatcher(self.taxonomy())
+    
+    def taxonomy_version(self) -> str:
+        """Hash of the keyword tables, extraction version, tree builder and site selectors"""
+        taxonomy = {
+            'extraction_version': self.EXTRACTION_VERSION,
+            'html_parser': self.html_parser,
+            'sites': self.site_extractors.specs(),
+            **self.taxonomy()
+        }
+        return hashlib.md5(json.dumps(taxonomy, sort_keys=True).encode()).hexdigest()
+    
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Canonical form of a URL: lowercase host, sorted query, no fragment or tracking params"""
+        parts = urlparse(url.strip())
+        query = sorted(
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_') and key.lower() not in ('jsessionid', 'sessionid', 'sid')
+        )
+        path = parts.path.rstrip('/') or '/'
+        return urlunparse((parts.scheme.lower(), parts.netloc.lower(), path, '', urlencode(query), ''))
     
     def generate_lead_id(self, url: str, title: str) -> str:
-        """Generate unique lead ID"""
-        unique_string = f"{url}{title}{datetime.now().isoformat()}"
+        """Generate a lead ID that is stable across runs for the same tender"""
+        normalized_title = ' '.join(title.lower().split())
+        unique_string = f"{self.normalize_url(url)}|{normalized_title}"
         return hashlib.md5(unique_string.encode()).hexdigest()[:12].upper()
     
-    def classify_products(self, text: str) -> tuple:
+    def match_keywords(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        """Find product, signal, industry and facility keywords in one pass"""
+        return self.matcher.match(text)
+    
+    def classify_products(self, text: str, hits: Optional[Dict] = None) -> tuple:
         """Classify products and calculate confidence"""
-        text_lower = text.lower()
+        hits = hits or self.match_keywords(text)
         products = []
         confidences = {}
         keywords_matched = []
         
-        for product, keywords in self.product_keywords.items():
-            matches = [kw for kw in keywords if kw in text_lower]
-            if matches:
-                products.append(product)
-                confidences[product] = min(len(matches) / len(keywords), 1.0)
-                keywords_matched.extend(matches)
+        for product, matches in hits['products'].items():
+            products.append(product)
+            confidences[product] = min(len(matches) / len(self.product_keywords[product]), 1.0)
+            keywords_matched.extend(matches)
         
         return products, confidences, list(set(keywords_matched))
     
-    def detect_signals(self, text: str) -> tuple:
+    def detect_signals(self, text: str, hits: Optional[Dict] = None) -> tuple:
         """Detect signals and calculate strength"""
-        text_lower = text.lower()
-        signals = []
-        
-        for signal_type, keywords in self.signal_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                signals.append(signal_type)
+        hits = hits or self.match_keywords(text)
+        signals = list(hits['signals'])
         
         # Determine signal strength
         if 'urgent' in signals or len(signals) >= 3:
@@ -93,54 +323,66 @@ class TenderScraper:
         
         return signals, strength
     
-    def extract_deadline(self, text: str) -> Optional[str]:
-        """Extract deadline from text"""
-        # Common date patterns
-        date_patterns = [
-            r'\d{2}[-/]\d{2}[-/]\d{4}',
-            r'\d{4}[-/]\d{2}[-/]\d{2}',
-            r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    date_str = match.group(0)
-                    # Try to parse and convert to ISO format
-                    # This is simplified - you'd need proper date parsing
-                    return datetime.now() + timedelta(days=30)  # Default 30 days
-                except:
-                    pass
+    def extract_deadline(self, text: str) -> Optional[datetime]:
+        """Extract deadline from text
         
-        return None
+        Prefers the first date preceded by closing wording ("last date",
+        "due", "bid submission", ...); without one, the latest date, since
+        publication and opening dates come before the closing date.
+        """
+        latest = None
+        previous_end = 0
+        for match in ExtractionPatterns.DEADLINE.finditer(text):
+            deadline = parse_deadline(match.group(0))
+            if not deadline:
+                continue
+            # Only the words between the previous date and this one
+            cue_start = max(previous_end, match.start() - ExtractionPatterns.DEADLINE_CUE_WINDOW)
+            if ExtractionPatterns.DEADLINE_CUE.search(text, cue_start, match.start()):
+                return deadline
+            previous_end = match.end()
+            if latest is None or deadline > latest:
+                latest = deadline
+        
+        return latest
     
     def extract_value(self, text: str) -> Optional[float]:
         """Extract estimated value from text"""
-        # Look for currency patterns
-        currency_patterns = [
-            r'₹\s*[\d,]+(?:\.\d{2})?',
-            r'INR\s*[\d,]+(?:\.\d{2})?',
-            r'USD\s*[\d,]+(?:\.\d{2})?',
-            r'\$\s*[\d,]+(?:\.\d{2})?'
-        ]
-        
-        for pattern in currency_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    value_str = re.sub(r'[^\d.]', '', match.group(0))
-                    return float(value_str)
-                except:
-                    pass
+        # First amount in the preferred currency: ₹ over INR over USD over $
+        best = None
+        for match in ExtractionPatterns.VALUE.finditer(text):
+            rank = ExtractionPatterns.CURRENCY_RANK[match.group('currency').upper()]
+            if best is not None and rank >= best[0]:
+                continue
+            try:
+                best = (rank, float(match.group('amount').replace(',', '')))
+            except ValueError:
+                continue
+            if rank == 0:
+                break
         
-        return None
+        return best[1] if best else None
+    
+    def extract_amount(self, text: str) -> Optional[float]:
+        """Amount in a value field, with or without a currency marker"""
+        value = self.extract_value(text)
+        if value is not None:
+            return value
+        match = ExtractionPatterns.AMOUNT.search(text)
+        return float(match.group(0).replace(',', '')) if match else None
+    
+    def extract_tender_id(self, text: str) -> Optional[str]:
+        """Extract tender reference number from text"""
+        match = ExtractionPatterns.TENDER_ID.search(text)
+        return match.group(1) if match else None
     
     def calculate_scores(self, products: List[str], confidences: Dict, 
                         signals: List[str], deadline_days: int) -> tuple:
         """Calculate urgency, confidence, and overall scores"""
-        # Urgency score (0-1)
-        if deadline_days <= 7:
+        # Urgency score (0-1); a closed tender can no longer be bid on
+        if deadline_days < 0:
+            urgency = 0.0
+        elif deadline_days <= 7:
             urgency = 1.0
         elif deadline_days <= 14:
             urgency = 0.8
@@ -156,19 +398,24 @@ class TenderScraper:
             confidence = 0.3
         
         # Overall score (weighted average)
-        overall = (urgency * 0.3) + (confidence * 0.5) + (len(signals) * 0.1)
+        overall = (urgency * self.URGENCY_WEIGHT) + (confidence * self.CONFIDENCE_WEIGHT) + (len(signals) * self.SIGNAL_WEIGHT)
         overall = min(overall, 1.0)
         
         return round(urgency, 2), round(confidence, 2), round(overall, 2)
     
+    def score_batch(self, tenders: List[Dict]) -> List[Dict]:
+        """Recompute scores for many tenders at once with the vectorized scorer"""
+        score_tenders(tenders, self.URGENCY_WEIGHT, self.CONFIDENCE_WEIGHT, self.SIGNAL_WEIGHT)
+        return tenders
+    
     def scrape_generic_tender(self, url: str, soup: BeautifulSoup) -> List[Dict]:
         """Generic scraper for tender listings"""
         tenders = []
         
         # Try to find tender listings (this is simplified - each site needs custom logic)
-        tender_containers = soup.find_all(['div', 'tr', 'li'], class_=re.compile(r'tender|item|row', re.I))
+        tender_containers = soup.find_all(ExtractionPatterns.CONTAINER_TAGS, class_=ExtractionPatterns.CONTAINER_CLASS)
         
-        for container in tender_containers[:10]:  # Limit to 10 per page
+        for container in tender_containers[:self.max_containers]:
             try:
                 # Extract title
                 title_elem = container.find(['h1', 'h2', 'h3', 'h4', 'a', 'strong'])
@@ -185,132 +432,177 @@ class TenderScraper:
                 link_elem = container.find('a', href=True)
                 tender_url = urljoin(url, link_elem['href']) if link_elem else url
                 
-                # Combine text for analysis
-                full_text = f"{title} {description}"
-                
-                # Classify and analyze
-                products, confidences, keywords_matched = self.classify_products(full_text)
-                
-                if not products:
-                    continue  # Skip if no relevant products found
-                
-                signals, signal_strength = self.detect_signals(full_text)
-                deadline = self.extract_deadline(full_text)
-                estimated_value = self.extract_value(full_text)
-                
-                # Calculate scores
-                deadline_days = 30  # Default
-                if deadline:
-                    deadline_days = (deadline - datetime.now()).days
-                
-                urgency, confidence, overall = self.calculate_scores(
-                    products, confidences, signals, deadline_days
-                )
+                tender = self.build_tender(title, description, tender_url)
+                if tender:
+                    tenders.append(tender)
                 
-                # Extract tender ID
-                tender_id_match = re.search(r'(?:tender|ref|id)[:\s#]*([A-Z0-9-]+)', full_text, re.I)
-                tender_id = tender_id_match.group(1) if tender_id_match else f"TN{datetime.now().strftime('%Y%m%d')}{random.randint(100,999)}"
+            except Exception as e:
+                logger.error(f"Error parsing tender: {e}")
+                continue
+        
+        return tenders
+    
+    def scrape_site_tender(self, url: str, soup: BeautifulSoup, site: SiteExtractor) -> Optional[List[Dict]]:
+        """Tender listings of a known portal, read with its selectors
+        
+        Returns None when the container selector matches nothing, which
+        usually means the portal's markup has changed.
+        """
+        tender_containers = site.containers(soup)
+        if not tender_containers:
+            return None
+        
+        tenders = []
+        for container in tender_containers[:self.max_containers]:
+            try:
+                elements = site.extract(container)
+                title = site.text(elements.get('title'))
+                if not title:
+                    continue
+                description = site.text(elements.get('description')) or title
                 
-                # Create tender object
-                tender = {
-                    "lead_id": self.generate_lead_id(tender_url, title),
-                    "company_name": self.extract_company_name(full_text),
-                    "source_type": "tender",
-                    "source_url": tender_url,
-                    "products_recommended": products,
-                    "product_confidence": confidences,
-                    "industry_sector": self.classify_industry(full_text),
-                    "location": self.extract_location(full_text),
-                    "facility_type": self.extract_facility_type(full_text),
-                    "signals": signals,
-                    "signal_strength": signal_strength,
-                    "keywords_matched": keywords_matched,
-                    "urgency_score": urgency,
-                    "confidence_score": confidence,
-                    "overall_score": overall,
-                    "title": title[:200],
-                    "description": description[:500],
-                    "deadline": deadline.isoformat() if deadline else None,
-                    "estimated_value": estimated_value,
-                    "tender_id": tender_id,
-                    "next_action": self.generate_next_action(products, signals),
-                    "discovery_date": datetime.now().isoformat(),
-                    "extraction_method": "Tender Parser",
-                    "raw_context": full_text[:500]
-                }
+                link_elem = elements.get('link')
+                if link_elem is not None and not link_elem.get('href'):
+                    link_elem = link_elem.find('a', href=True)
+                if link_elem is None:
+                    link_elem = container.find('a', href=True)
+                tender_url = urljoin(url, link_elem['href']) if link_elem else url
                 
-                tenders.append(tender)
+                fields = {field: site.text(elements.get(field)) for field in ('deadline', 'value', 'tender_id', 'company')}
+                tender = self.build_tender(title, description, tender_url, fields, site.name)
+                if tender:
+                    tenders.append(tender)
                 
             except Exception as e:
-                logger.error(f"Error parsing tender: {e}")
+                logger.error(f"Error parsing {site.name} tender: {e}")
                 continue
         
         return tenders
     
+    def build_tender(self, title: str, description: str, tender_url: str,
+                     fields: Optional[Dict[str, Optional[str]]] = None,
+                     site: Optional[str] = None) -> Optional[Dict]:
+        """Classify and score one listed tender, None when it mentions no products
+        
+        fields holds deadline, value, tender_id and company text picked out
+        by a site's selectors; missing ones are found in the title and
+        description text.
+        """
+        fields = fields or {}
+        
+        # Combine text for analysis
+        full_text = f"{title} {description}"
+        
+        # Classify and analyze
+        with self.metrics.stage('match_keywords'):
+            hits = self.match_keywords(full_text)
+        with self.metrics.stage('classify_products'):
+            products, confidences, keywords_matched = self.classify_products(full_text, hits)
+        
+        if not products:
+            return None  # Skip if no relevant products found
+        
+        with self.metrics.stage('detect_signals'):
+            signals, signal_strength = self.detect_signals(full_text, hits)
+        lead_id = self.generate_lead_id(tender_url, title)
+        with self.metrics.stage('extract'):
+            deadline = (
+                fields.get('deadline') and self.extract_deadline(fields['deadline'])
+            ) or self.extract_deadline(full_text)
+            estimated_value = self.extract_amount(fields['value']) if fields.get('value') else None
+            if estimated_value is None:
+                estimated_value = self.extract_value(full_text)
+            location = self.extract_location_details(full_text) or {}
+            company_name = fields.get('company') or self.extract_company_name(full_text)
+            # Extract tender ID, falling back to one derived from the lead ID
+            tender_id = fields.get('tender_id') or self.extract_tender_id(full_text) or f"TN{lead_id}"
+        
+        # Calculate scores
+        deadline_days = 30  # Default
+        if deadline:
+            # Calendar days, so a tender closing today is still open
+            deadline_days = (deadline.date() - datetime.now().date()).days
+        
+        with self.metrics.stage('score'):
+            urgency, confidence, overall = self.calculate_scores(
+                products, confidences, signals, deadline_days
+            )
+        
+        # Create tender object
+        return {
+            "lead_id": lead_id,
+            "company_name": company_name,
+            "source_type": "tender",
+            "source_url": tender_url,
+            "products_recommended": products,
+            "product_confidence": confidences,
+            "industry_sector": self.classify_industry(full_text, hits),
+            "location": self.extract_location(full_text, location),
+            "city": location.get('city'),
+            "state": location.get('state'),
+            "country": location.get('country'),
+            "location_confidence": location.get('confidence'),
+            "facility_type": self.extract_facility_type(full_text, hits),
+            "signals": signals,
+            "signal_strength": signal_strength,
+            "keywords_matched": keywords_matched,
+            "urgency_score": urgency,
+            "confidence_score": confidence,
+            "overall_score": overall,
+            "title": title[:200],
+            "description": description[:500],
+            "deadline": deadline.isoformat() if deadline else None,
+            "estimated_value": estimated_value,
+            "tender_id": tender_id,
+            "next_action": self.generate_next_action(products, signals),
+            "discovery_date": datetime.now().isoformat(),
+            "extraction_method": f"Tender Parser ({site})" if site else "Tender Parser",
+            "raw_context": full_text[:500]
+        }
+    
     def extract_company_name(self, text: str) -> str:
         """Extract company name from text"""
-        # Look for common patterns
-        patterns = [
-            r'(?:by|for|from)\s+([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corporation|Pvt|Private))',
-            r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corporation|Pvt|Private))'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        if not ExtractionPatterns.COMPANY_SUFFIX.search(text):
+            return "Unknown Organization"
+        
+        for pattern in ExtractionPatterns.COMPANY_NAME:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
         return "Unknown Organization"
     
-    def classify_industry(self, text: str) -> str:
+    def classify_industry(self, text: str, hits: Optional[Dict] = None) -> str:
         """Classify industry sector"""
-        text_lower = text.lower()
-        
-        industries = {
-            'shipping': ['ship', 'marine', 'vessel', 'port', 'maritime'],
-            'aviation': ['aviation', 'airport', 'aircraft', 'airline'],
-            'automotive': ['automotive', 'vehicle', 'car', 'truck'],
-            'manufacturing': ['manufacturing', 'factory', 'plant', 'industrial'],
-            'energy': ['power', 'energy', 'electricity', 'generator'],
-            'transport': ['transport', 'logistics', 'fleet']
-        }
+        hits = hits or self.match_keywords(text)
         
-        for industry, keywords in industries.items():
-            if any(kw in text_lower for kw in keywords):
-                return industry
+        # Categories come back in table order, so the first is the old first match
+        for industry in hits['industries']:
+            return industry
         
         return "general"
     
-    def extract_location(self, text: str) -> Optional[str]:
+    def extract_location_details(self, text: str) -> Optional[Dict]:
+        """First place mentioned in text as city, state, country and confidence"""
+        return default_gazetteer().find_first(text)
+    
+    def extract_location(self, text: str, details: Optional[Dict] = None) -> Optional[str]:
         """Extract location from text"""
-        # Indian cities/states pattern
-        locations = [
-            'Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Kolkata', 'Hyderabad',
-            'Pune', 'Ahmedabad', 'Surat', 'Jaipur', 'Maharashtra', 'Karnataka',
-            'Tamil Nadu', 'Gujarat', 'Rajasthan'
-        ]
-        
-        for location in locations:
-            if location.lower() in text.lower():
-                return location
+        details = details or self.extract_location_details(text)
+        if not details:
+            return None
         
-        return None
+        # Always include the state so state-level filters match city hits too
+        parts = [details['city'], details['state']]
+        parts = [part for i, part in enumerate(parts) if part and part not in parts[:i]]
+        return ', '.join(parts) or None
     
-    def extract_facility_type(self, text: str) -> Optional[str]:
+    def extract_facility_type(self, text: str, hits: Optional[Dict] = None) -> Optional[str]:
         """Extract facility type"""
-        text_lower = text.lower()
-        
-        facilities = {
-            'port': ['port', 'harbor', 'jetty'],
-            'airport': ['airport', 'aerodrome'],
-            'warehouse': ['warehouse', 'depot', 'storage'],
-            'plant': ['plant', 'factory', 'manufacturing unit'],
-            'station': ['station', 'depot']
-        }
+        hits = hits or self.match_keywords(text)
         
-        for facility, keywords in facilities.items():
-            if any(kw in text_lower for kw in keywords):
-                return facility
+        for facility in hits['facilities']:
+            return facility
         
         return None
     
@@ -323,73 +615,565 @@ class TenderScraper:
         else:
             return f"Follow up on tender opportunity for {', '.join(products)}"
     
-    def scrape_website(self, url: str, max_retries: int = 3) -> List[Dict]:
-        """Scrape a single website with retry logic"""
+    def scrape_website(self, url: str, max_retries: Optional[int] = None) -> List[Dict]:
+        """Scrape a single website with retry logic, following its listing pages"""
+        tenders, next_urls = self.fetch_listing(url, max_retries)
+        if self.page_budget > 1:
+            tenders = self.follow_pages(
+                url, tenders, next_urls, lambda page_url: self.fetch_listing(page_url, max_retries)
+            )
+        return tenders
+    
+    def fetch_listing(self, url: str, max_retries: Optional[int] = None) -> Tuple[List[Dict], Optional[List[str]]]:
+        """Fetch and parse one listing page into (tenders, next page URLs)
+        
+        The page URLs are None when the tenders came from the cache or
+        fingerprint store without parsing the page.
+        """
+        tenders, response = self.fetch_page(url, max_retries)
+        if response is None:
+            return tenders, None
+        
+        try:
+            tenders, next_urls = self.parse_listing(url, response.content)
+        except Exception as e:
+            logger.error(f"Unexpected error scraping {url}: {e}")
+            return [], []
+        
+        self.store_parsed(url, response, tenders, next_urls)
+        logger.info(f"Found {len(tenders)} tenders from {url}")
+        return tenders, next_urls
+    
+    def follow_pages(self, url: str, tenders: List[Dict], next_urls: Optional[List[str]],
+                     fetch_listing: Callable[[str], Tuple[List[Dict], Optional[List[str]]]]) -> List[Dict]:
+        """Fetch a portal's further listing pages, up to page_budget pages in all
+        
+        Pages go out in waves of per_host_concurrency. Portals list newest
+        tenders first, so following stops at the first page whose tenders
+        were all seen already, earlier in this run or, with a seen index, in
+        a previous one. An empty page without pager links ends the listing.
+        """
+        collected = list(tenders)
+        seen_ids = {tender['lead_id'] for tender in tenders}
+        if tenders and not self._unseen(seen_ids):
+            self.metrics.inc('pagination_stops_total', reason='seen')
+            return collected
+        
+        queue = self._page_links(url, tenders, next_urls)
+        visited = {self.normalize_url(url)}
+        pages = 1
+        with ThreadPoolExecutor(max_workers=self.per_host_concurrency) as pool:
+            while queue and pages < self.page_budget:
+                wave, rest = [], []
+                for page_url in queue:
+                    key = self.normalize_url(page_url)
+                    if key in visited:
+                        continue
+                    if len(wave) < min(self.per_host_concurrency, self.page_budget - pages):
+                        visited.add(key)
+                        wave.append(page_url)
+                    else:
+                        rest.append(page_url)
+                if not wave:
+                    break
+                pages += len(wave)
+                queue = rest
+                self.metrics.inc('pages_followed_total', len(wave))
+                
+                for page_url, (page_tenders, page_links) in zip(wave, pool.map(fetch_listing, wave)):
+                    fresh = [tender for tender in page_tenders if tender['lead_id'] not in seen_ids]
+                    fresh_ids = {tender['lead_id'] for tender in fresh}
+                    collected.extend(fresh)
+                    seen_ids.update(fresh_ids)
+                    if page_tenders and not self._unseen(fresh_ids):
+                        self.metrics.inc('pagination_stops_total', reason='seen')
+                        logger.info(f"Only seen tenders on {page_url}, stopping pagination")
+                        return collected
+                    links = self._page_links(page_url, page_tenders, page_links)
+                    if not page_tenders and not links:
+                        self.metrics.inc('pagination_stops_total', reason='end')
+                        return collected
+                    queue.extend(links)
+        
+        self.metrics.inc('pagination_stops_total', reason='budget' if queue else 'end')
+        return collected
+    
+    def _unseen(self, lead_ids: Set[str]) -> Set[str]:
+        """The lead_ids not already in the seen index"""
+        if self.seen_index and lead_ids:
+            return lead_ids - self.seen_index.known(lead_ids)
+        return lead_ids
+    
+    def _page_links(self, url: str, tenders: List[Dict], next_urls: Optional[List[str]]) -> List[str]:
+        """Pager links of a listing page, recovered from the fingerprint store or
+        the cached body when it wasn't parsed"""
+        if next_urls is not None:
+            return next_urls
+        if not tenders:
+            return []
+        if self.fingerprints:
+            stored = self.fingerprints.page_links(url)
+            if stored is not None:
+                return stored
+        if not self.http_cache:
+            return []
+        body = self.http_cache.get_body(url)
+        if body is None:
+            return []
+        site = self.site_extractors.lookup(url)
+        return self.pagination_links(url, self.make_soup(body, site), site)
+    
+    def pagination_links(self, url: str, soup: BeautifulSoup, site: Optional[SiteExtractor] = None) -> List[str]:
+        """Further listing pages linked from a page, nearest first
+        
+        Takes the site's next_page link, the rel="next" link, or else one
+        labelled "Next" or ">>", plus numbered pager links past the current
+        page. When those change a page query parameter, enough following
+        pages to fill a wave of per_host_concurrency are extrapolated from
+        it, so they can be fetched together instead of waiting for each
+        page's own pager.
+        """
+        anchors = soup.find_all('a', href=True)
+        next_links = site.next_links(soup) if site else []
+        if not next_links:
+            next_links = [elem['href'] for elem in soup.find_all(['a', 'link'], href=True, rel='next')]
+        if not next_links:
+            for anchor in anchors:
+                label = ' '.join([
+                    anchor.get_text(' ', strip=True), anchor.get('title', ''),
+                    anchor.get('aria-label', ''), ' '.join(anchor.get('class', []))
+                ])
+                if ExtractionPatterns.NEXT_LINK.search(label):
+                    next_links.append(anchor['href'])
+        next_links = [link for link in (urljoin(url, href) for href in next_links)
+                      if urlparse(link).scheme in ('http', 'https')]
+        
+        pages = {}
+        param = None
+        for link in next_links + [urljoin(url, anchor['href']) for anchor in anchors]:
+            found = self._page_param(url, link)
+            if not found:
+                continue
+            name, current, value = found
+            if value <= current:
+                continue
+            if param is None:
+                param = found
+            if name == param[0]:
+                pages.setdefault(value, link)
+        
+        if param:
+            name, current, value = param
+            step = value - current
+            for n in range(1, min(self.per_host_concurrency, self.page_budget - 1) + 1):
+                pages.setdefault(current + n * step, self._with_page(url, name, current + n * step))
+        
+        # Next links without a page parameter (path-style pagination) come first
+        links = [link for link in next_links if not self._page_param(url, link)]
+        return links + [pages[value] for value in sorted(pages)]
+    
+    @staticmethod
+    def _page_param(url: str, link: str) -> Optional[Tuple[str, int, int]]:
+        """(parameter, current page, linked page) when link only changes url's page parameter"""
+        base, target = urlparse(url), urlparse(link)
+        if (base.netloc.lower(), base.path.rstrip('/')) != (target.netloc.lower(), target.path.rstrip('/')):
+            return None
+        current, linked = dict(parse_qsl(base.query)), dict(parse_qsl(target.query))
+        changed = [key for key in current.keys() | linked.keys() if current.get(key) != linked.get(key)]
+        if len(changed) != 1 or changed[0].lower() not in ExtractionPatterns.PAGE_PARAMS:
+            return None
+        name = changed[0]
+        default = '0' if name.lower() in ExtractionPatterns.START_PARAMS else '1'
+        value, page = current.get(name, default), linked.get(name, '')
+        if not value.isdigit() or not page.isdigit():
+            return None
+        return name, int(value), int(page)
+    
+    @staticmethod
+    def _with_page(url: str, name: str, value: int) -> str:
+        parts = urlparse(url)
+        query = [(key, val) for key, val in parse_qsl(parts.query, keep_blank_values=True) if key != name]
+        query.append((name, str(value)))
+        return urlunparse(parts._replace(query=urlencode(query), fragment=''))
+    
+    def fetch_page(self, url: str, max_retries: Optional[int] = None) -> Tuple[List[Dict], Optional[requests.Response]]:
+        """Fetch a portal page with retry logic
+        
+        Returns (tenders, None) when the result is already known (cache hit,
+        unchanged content or failure) and ([], response) when the body still
+        has to be parsed.
+        """
         logger.info(f"Scraping: {url}")
+        host = urlparse(url).netloc.lower()
+        max_retries = max_retries or self.max_retries
+        
+        if not self.rate_limiter.allow(host):
+            logger.warning(f"Circuit open for {host}, skipping {url}")
+            return [], None
         
         for attempt in range(max_retries):
             try:
-                # Add delay to respect rate limits
-                time.sleep(random.uniform(2, 5))
+                # Wait for this host's rate limit token
+                self.rate_limiter.acquire(host)
                 
-                response = self.session.get(url, timeout=30)
+                headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+                response = self._get(url, host, headers=headers)
+                if response.status_code in (429, 503):
+                    delay = self.rate_limiter.throttle(host, response.headers.get('Retry-After'), attempt)
+                    logger.warning(f"Attempt {attempt + 1} throttled by {url} "
+                                   f"(HTTP {response.status_code}), backing off {delay:.1f}s")
+                    if attempt == max_retries - 1:
+                        logger.error(f"Max retries reached for {url}")
+                        self.rate_limiter.record_failure(host)
+                        return [], None
+                    continue
+                if response.status_code == 304 and self.http_cache:
+                    self.rate_limiter.record_success(host)
+                    tenders = self.http_cache.get_tenders(url, self.taxonomy_version())
+                    if tenders is not None:
+                        logger.info(f"Not modified, reusing {len(tenders)} cached tenders from {url}")
+                        return tenders, None
+                    # Validators outlived the stored result or it predates the
+                    # current extraction, refetch unconditionally
+                    self.rate_limiter.acquire(host)
+                    response = self._get(url, host)
                 response.raise_for_status()
+                self.rate_limiter.record_success(host)
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Use generic scraper (in production, you'd have site-specific scrapers)
-                tenders = self.scrape_generic_tender(url, soup)
+                # Skip parsing when the page body is unchanged since the last run
+                if self.fingerprints:
+                    tenders = self.fingerprints.lookup(url, content_fingerprint(response.content))
+                    if tenders is not None:
+                        logger.info(f"Content unchanged, reusing {len(tenders)} tenders from {url}")
+                        if self.http_cache:
+                            self.http_cache.store(url, response, tenders, self.taxonomy_version())
+                        return tenders, None
                 
-                logger.info(f"Found {len(tenders)} tenders from {url}")
-                return tenders
+                return [], response
                 
             except requests.exceptions.RequestException as e:
+                self.metrics.inc('fetch_errors_total', host=host)
+                status = getattr(e.response, 'status_code', None)
+                if status and 400 <= status < 500:
+                    # Throttling is handled above; other client errors, such as
+                    # an extrapolated page past the end, won't change on retry
+                    logger.warning(f"{url} returned HTTP {status}, not retrying")
+                    return [], None
                 logger.error(f"Attempt {attempt + 1} failed for {url}: {e}")
                 if attempt == max_retries - 1:
                     logger.error(f"Max retries reached for {url}")
-                    return []
-                time.sleep(5 * (attempt + 1))
+                    self.rate_limiter.record_failure(host)
+                    return [], None
+                time.sleep(self.rate_limiter.backoff_delay(attempt))
             except Exception as e:
                 logger.error(f"Unexpected error scraping {url}: {e}")
-                return []
+                return [], None
+        
+        return [], None
+    
+    def _get(self, url: str, host: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = self.session.get(url, timeout=self.request_timeout, **kwargs)
+        self.metrics.fetch(host, time.perf_counter() - start, len(response.content), response.status_code)
+        return response
+    
+    def parse_page(self, url: str, content: bytes) -> List[Dict]:
+        """Parse a fetched page into tenders"""
+        return self.parse_listing(url, content)[0]
+    
+    def make_soup(self, content: bytes, site: Optional[SiteExtractor] = None) -> BeautifulSoup:
+        """Parse a listing page, only its containers and links when targeted_parse is set
+        
+        Known portals build the subtrees their parse_only names, or the
+        whole page when they don't name any.
+        """
+        if not self.targeted_parse:
+            return make_soup(content, self.html_parser)
+        parse_only = site.tag_filter if site else self.listing_filter
+        return make_soup(content, self.html_parser, parse_only)
+    
+    @staticmethod
+    def _listing_tag(name: str, attrs: Dict) -> bool:
+        """Tags a listing is read from: tender containers, and links for pagination
+        
+        Tables and lists are kept whole, or an unclosed <tr> or <li> would
+        run on past the end of its table.
+        """
+        if name in ('a', 'link'):
+            return 'href' in attrs
+        if name in ExtractionPatterns.CONTAINER_PARENTS:
+            return True
+        if name not in ExtractionPatterns.CONTAINER_TAGS:
+            return False
+        classes = attrs.get('class') or ''
+        if not isinstance(classes, str):
+            classes = ' '.join(classes)
+        return bool(ExtractionPatterns.CONTAINER_CLASS.search(classes))
+    
+    def parse_settings(self) -> Dict:
+        """Constructor arguments that shape parsing, to rebuild this scraper in worker processes"""
+        return {
+            'page_budget': self.page_budget,
+            'max_containers': self.max_containers,
+            'html_parser': self.html_parser,
+            'targeted_parse': self.targeted_parse,
+            'site_extractors': self.site_extractors
+        }
+    
+    def parse_listing(self, url: str, content: bytes) -> Tuple[List[Dict], List[str]]:
+        """Parse a fetched page into tenders and the listing pages it links to"""
+        site = self.site_extractors.lookup(url)
+        with self.metrics.stage('parse_html'):
+            soup = self.make_soup(content, site)
+        
+        # Known portals go straight to their selectors; the rest, and known
+        # portals whose markup no longer matches, get the generic heuristics
+        with self.metrics.stage('parse'):
+            tenders = self.scrape_site_tender(url, soup, site) if site else None
+            if tenders is None:
+                if site:
+                    logger.warning(f"No {site.name} containers on {url}, using the generic parser")
+                    self.metrics.inc('site_extractor_misses_total', site=site.name)
+                    if site.parse_only and self.targeted_parse:
+                        soup = self.make_soup(content)
+                tenders = self.scrape_generic_tender(url, soup)
+        next_urls = self.pagination_links(url, soup, site) if self.page_budget > 1 else []
+        return tenders, next_urls
+    
+    def store_parsed(self, url: str, response: requests.Response, tenders: List[Dict],
+                     next_urls: Optional[List[str]] = None):
+        """Remember parsed tenders and pager links so unchanged pages skip parsing next time"""
+        if self.fingerprints:
+            # With a page budget of 1 the pager isn't read, so store no links
+            # rather than an empty list that would end a later run's pagination
+            self.fingerprints.store(
+                url, content_fingerprint(response.content), tenders,
+                next_urls if self.page_budget > 1 else None
+            )
+        if self.http_cache:
+            self.http_cache.store(url, response, tenders, self.taxonomy_version())
+    
+    def scrape_all_websites(self, websites: List[Dict], concurrent: bool = False,
+                            checkpoint_path: Optional[str] = None,
+                            fsync_every: int = 100,
+                            parse_workers: Optional[int] = None) -> List[Dict]:
+        """Scrape all websites from the list
+        
+        With checkpoint_path, tenders are streamed to an NDJSON file as each
+        portal finishes and an interrupted run resumes after the last
+        completed portal. With parse_workers (0 means one per core), pages
+        are parsed in a process pool while fetching continues concurrently.
+        """
+        writer = NDJSONCheckpointWriter(checkpoint_path, fsync_every) if checkpoint_path else None
+        try:
+            if parse_workers is not None:
+                all_tenders = asyncio.run(self.scrape_all_websites_async(
+                    websites, writer, parse_workers=parse_workers or os.cpu_count() or 1
+                ))
+            elif concurrent:
+                all_tenders = asyncio.run(self.scrape_all_websites_async(websites, writer))
+            else:
+                all_tenders = []
+                for site in websites:
+                    all_tenders.extend(self._process_portal(site, writer))
+            if writer:
+                writer.finalize()
+        except BaseException:
+            if writer:
+                writer.close()
+            raise
+        finally:
+            self.rate_limiter.save()
+            self.export_metrics()
+        
+        return all_tenders
+    
+    def export_metrics(self):
+        """Snapshot cache ratios and write the run's metrics to metrics_path"""
+        if self.http_cache:
+            self.metrics.cache('http', self.http_cache.hits, self.http_cache.misses)
+        if self.fingerprints:
+            self.metrics.cache('fingerprint', self.fingerprints.hits, self.fingerprints.misses)
+        info = parse_deadline.cache_info()
+        self.metrics.cache('parse_deadline', info.hits, info.misses)
+        if self.metrics_path:
+            try:
+                self.metrics.write(self.metrics_path)
+            except OSError as e:
+                logger.error(f"Error writing metrics: {e}")
+    
+    def _process_portal(self, site: Dict, writer: Optional[NDJSONCheckpointWriter] = None) -> List[Dict]:
+        """Scrape one portal and checkpoint its tenders"""
+        portal_name = site['Portal Name']
+        url = site['Website URL']
+        
+        if writer and writer.is_done(url):
+            logger.info(f"Skipping {portal_name}, already checkpointed")
+            return []
+        
+        logger.info(f"\n{'='*60}")
+        logger.info(f"Processing: {portal_name}")
+        logger.info(f"URL: {url}")
+        
+        try:
+            tenders = self.scrape_website(url)
+        except Exception as e:
+            logger.error(f"Error processing {portal_name}: {e}")
+            return []
+        
+        return self._emit(url, tenders, writer)
+    
+    def _emit(self, url: str, tenders: List[Dict],
+              writer: Optional[NDJSONCheckpointWriter] = None) -> List[Dict]:
+        """Filter a portal's tenders to the delta and write them out
         
-        return []
+        Tenders are only recorded as seen once the portal's checkpoint is
+        durable, so a crash in between re-emits them on resume instead of
+        losing them.
+        """
+        scraped = tenders
+        if self.seen_index:
+            tenders = self.seen_index.delta(scraped, record=False)
+        if writer:
+            with self.metrics.stage('write'):
+                for tender in tenders:
+                    writer.write(tender)
+                writer.mark_portal_done(url)
+        if self.seen_index:
+            self.seen_index.record(scraped)
+        self.metrics.inc('portals_total')
+        self.metrics.inc('tenders_total', len(tenders))
+        return tenders
     
-    def scrape_all_websites(self, websites: List[Dict]) -> List[Dict]:
-        """Scrape all websites from the list"""
-        all_tenders = []
+    async def scrape_all_websites_async(self, websites: List[Dict],
+                                        writer: Optional[NDJSONCheckpointWriter] = None,
+                                        parse_workers: Optional[int] = None) -> List[Dict]:
+        """Scrape all websites concurrently, capped globally and per host
+        
+        When parse_workers is set, fetch threads only download pages and the
+        CPU-bound parsing and classification runs in a pool of worker
+        processes. Results come back to the event loop, which is the single
+        writer.
+        """
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        host_slots = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        parse_pool = None
+        if parse_workers:
+            parse_pool = ProcessPoolExecutor(
+                max_workers=parse_workers,
+                initializer=_init_parse_worker,
+                initargs=(self.taxonomy(), self.parse_settings())
+            )
+        loop = asyncio.get_running_loop()
+        
+        def fetch_listing_in_pool(url: str) -> Tuple[List[Dict], Optional[List[str]]]:
+            """fetch_listing with the parse handed to the worker pool, for follow_pages"""
+            tenders, response = self.fetch_page(url)
+            if response is None:
+                return tenders, None
+            start = time.perf_counter()
+            try:
+                tenders, next_urls = parse_pool.submit(_parse_in_worker, url, response.content).result()
+            except Exception as e:
+                logger.error(f"Unexpected error parsing {url}: {e}")
+                return [], []
+            self.metrics.observe('stage_seconds', time.perf_counter() - start, stage='parse_pool')
+            self.store_parsed(url, response, tenders, next_urls)
+            logger.info(f"Found {len(tenders)} tenders from {url}")
+            return tenders, next_urls
         
-        for site in websites:
+        async def scrape_site(site: Dict) -> List[Dict]:
             portal_name = site['Portal Name']
             url = site['Website URL']
+            if writer and writer.is_done(url):
+                logger.info(f"Skipping {portal_name}, already checkpointed")
+                return []
+            host = urlparse(url).netloc.lower()
+            if host not in host_slots:
+                host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
             
-            logger.info(f"\n{'='*60}")
-            logger.info(f"Processing: {portal_name}")
-            logger.info(f"URL: {url}")
+            # Take the host slot first so queued requests for a busy host
+            # don't hold global slots that other portals could use
+            async with host_slots[host]:
+                async with global_slots:
+                    logger.info(f"Processing: {portal_name} ({url})")
+                    try:
+                        # The per-host rate limiter inside scrape_website only
+                        # blocks this host while other hosts proceed
+                        if parse_pool is None:
+                            tenders = await loop.run_in_executor(executor, self.scrape_website, url)
+                        else:
+                            tenders, response = await loop.run_in_executor(executor, self.fetch_page, url)
+                    except Exception as e:
+                        logger.error(f"Error processing {portal_name}: {e}")
+                        return []
             
-            try:
-                tenders = self.scrape_website(url)
-                all_tenders.extend(tenders)
-                
-                # Save intermediate results
-                self.save_results(all_tenders, '/home/claude/tenders_partial.json')
+            # Parse after releasing the fetch slots so downloads keep flowing
+            if parse_pool is not None:
+                next_urls = None
+                if response is not None:
+                    # Stage timings inside the workers stay there; time the round trip
+                    start = time.perf_counter()
+                    try:
+                        tenders, next_urls = await loop.run_in_executor(
+                            parse_pool, _parse_in_worker, url, response.content
+                        )
+                    except Exception as e:
+                        logger.error(f"Unexpected error parsing {url}: {e}")
+                        return []
+                    self.metrics.observe('stage_seconds', time.perf_counter() - start, stage='parse_pool')
+                    self.store_parsed(url, response, tenders, next_urls)
+                    logger.info(f"Found {len(tenders)} tenders from {url}")
                 
-            except Exception as e:
-                logger.error(f"Error processing {portal_name}: {e}")
-                continue
+                # Further pages are fetched under the portal's slots again
+                if self.page_budget > 1 and (tenders or next_urls):
+                    async with host_slots[host]:
+                        async with global_slots:
+                            try:
+                                tenders = await loop.run_in_executor(
+                                    executor, self.follow_pages, url, tenders, next_urls, fetch_listing_in_pool
+                                )
+                            except Exception as e:
+                                logger.error(f"Error following pages of {portal_name}: {e}")
+            
+            # Runs on the event loop thread, so writes never interleave
+            return self._emit(url, tenders, writer)
         
-        return all_tenders
+        try:
+            # gather preserves input order, so output matches the sequential mode
+            results = await asyncio.gather(*(scrape_site(site) for site in websites))
+        finally:
+            executor.shutdown(wait=False)
+            if parse_pool is not None:
+                parse_pool.shutdown()
+        
+        return [tender for tenders in results for tender in tenders]
     
     def save_results(self, tenders: List[Dict], filename: str):
         """Save results to JSON file"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with self.metrics.stage('write'), open(filename, 'w', encoding='utf-8') as f:
                 json.dump(tenders, f, indent=2, ensure_ascii=False)
             logger.info(f"Saved {len(tenders)} tenders to {filename}")
         except Exception as e:
             logger.error(f"Error saving results: {e}")
 
 
+# Per-process scraper used by the parse worker pool
+_worker_scraper = None
+
+
+def _init_parse_worker(taxonomy: Dict[str, Dict[str, List[str]]], settings: Dict):
+    global _worker_scraper
+    _worker_scraper = TenderScraper(**settings)
+    _worker_scraper.load_taxonomy(taxonomy)
+
+
+def _parse_in_worker(url: str, content: bytes) -> Tuple[List[Dict], List[str]]:
+    return _worker_scraper.parse_listing(url, content)
+
+
 def create_mock_data():
     """Create mock data for demonstration"""
     mock_tenders = [
@@ -587,27 +1371,18 @@ def main():
     print("TENDER SCRAPING SUMMARY")
     print("="*60)
     print(f"Total Tenders Found: {len(mock_tenders)}")
+    summary = tender_summary(mock_tenders)
+    
     print("\nProduct Distribution:")
-    product_counts = {}
-    for tender in mock_tenders:
-        for product in tender['products_recommended']:
-            product_counts[product] = product_counts.get(product, 0) + 1
-    for product, count in sorted(product_counts.items(), key=lambda x: x[1], reverse=True):
+    for product, count in summary['products'].items():
         print(f"  - {product}: {count}")
     
     print("\nIndustry Distribution:")
-    industry_counts = {}
-    for tender in mock_tenders:
-        sector = tender['industry_sector']
-        industry_counts[sector] = industry_counts.get(sector, 0) + 1
-    for industry, count in sorted(industry_counts.items(), key=lambda x: x[1], reverse=True):
+    for industry, count in summary['industries'].items():
         print(f"  - {industry}: {count}")
     
     print("\nSignal Strength Distribution:")
-    signal_counts = {'high': 0, 'medium': 0, 'low': 0}
-    for tender in mock_tenders:
-        signal_counts[tender['signal_strength']] += 1
-    for strength, count in signal_counts.items():
+    for strength, count in summary['signal_strength'].items():
         print(f"  - {strength}: {count}")
     
     print("\n" + "="*60)
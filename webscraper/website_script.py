@@ -1,13 +1,30 @@
+import os
+import copy
 import json
 import time
 import random
+import hashlib
 import logging
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+import argparse
+import threading
+import requests
+from bs4 import BeautifulSoup
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urljoin, urlparse, urldefrag
 import re
 
+from rate_limit import HostRateLimiter
+from crawl_frontier import CrawlFrontier, record_fingerprint
+from gazetteer import INDIAN_STATES, INDIAN_CITIES, CITY_STATE_MAP, default_gazetteer, normalize_name
+from keyword_matcher import KeywordMatcher
+from batch_scoring import ReportAggregator
+from metrics import Metrics
+from streaming_io import iter_records, count_records, StreamingJSONWriter
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -22,15 +39,34 @@ class Config:
     INPUT_JSON = '/mnt/user-data/uploads/productathon.json'
     OUTPUT_JSON = '/mnt/user-data/outputs/productathon_complete.json'
     OUTPUT_REPORT = '/mnt/user-data/outputs/scraper_report.html'
+    # Prometheus text, or JSON if the path ends in .json; None disables the export
+    METRICS_PATH = '/mnt/user-data/outputs/scraper_metrics.prom'
+    COMPANIES_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Companies_data_set.json')
     
     TOP_N_COMPANIES = 50
     MAX_RETRIES = 3
     RATE_LIMIT_DELAY = 2
     TIMEOUT = 15
     
+    # Crawl mode: pages per company, link depth from the homepage and
+    # how many fetches run at once across all companies
+    CRAWL_MAX_PAGES = 10
+    CRAWL_MAX_DEPTH = 2
+    CRAWL_CONCURRENCY = 16
+    
+    # Scheduled crawls: requests spent per run and how long a crawl stays fresh
+    CRAWL_FRONTIER_DB = '/mnt/user-data/outputs/crawl_frontier.db'
+    CRAWL_REQUEST_BUDGET = 1000
+    CRAWL_FRESHNESS_HOURS = 24
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    
     URGENCY_WEIGHT = 0.6
     CONFIDENCE_WEIGHT = 0.4
     
+    # Mixed into every per-company random stream; change it to draw a different
+    # but still reproducible set of generated projects, signals and values
+    GENERATION_SEED = 0
+    
     PROJECT_KEYWORDS = [
         'project', 'initiative', 'program', 'development', 'expansion',
         'construction', 'facility', 'plant', 'refinery', 'pipeline',
@@ -39,45 +75,9 @@ class Config:
     ]
 
 class LocationDatabase:
-    INDIAN_STATES = {
-        'Maharashtra', 'Gujarat', 'Tamil Nadu', 'Karnataka', 'Andhra Pradesh',
-        'Telangana', 'Uttar Pradesh', 'West Bengal', 'Rajasthan', 'Madhya Pradesh',
-        'Kerala', 'Odisha', 'Punjab', 'Haryana', 'Bihar', 'Assam', 'Jharkhand',
-        'Chhattisgarh', 'Uttarakhand', 'Himachal Pradesh', 'Goa', 'Delhi'
-    }
-    
-    INDIAN_CITIES = {
-        'Mumbai', 'Delhi', 'Bangalore', 'Bengaluru', 'Hyderabad', 'Chennai', 'Kolkata',
-        'Pune', 'Ahmedabad', 'Surat', 'Jaipur', 'Lucknow', 'Kanpur', 'Nagpur',
-        'Visakhapatnam', 'Vizag', 'Vadodara', 'Baroda', 'Kochi', 'Cochin',
-        'Coimbatore', 'Bhopal', 'Indore', 'Nashik', 'Aurangabad', 'Rajahmundry',
-        'Kakinada', 'Mangalore', 'Mysore', 'Hazira', 'Jamnagar', 'Dahej',
-        'Mundra', 'Kandla', 'Panipat', 'Mathura', 'Numaligarh', 'Bongaigaon',
-        'Haldia', 'Paradip', 'Gurgaon', 'Gurugram', 'Noida', 'Faridabad',
-        'Ghaziabad', 'Manali', 'Nagothane', 'Silvassa', 'Vapi', 'Ankleshwar',
-        'Koyali', 'Vasai', 'Andheri', 'Navi Mumbai', 'Thane', 'Secunderabad'
-    }
-    
-    CITY_STATE_MAP = {
-        'Mumbai': 'Maharashtra', 'Pune': 'Maharashtra', 'Nagpur': 'Maharashtra',
-        'Nashik': 'Maharashtra', 'Aurangabad': 'Maharashtra', 'Thane': 'Maharashtra',
-        'Navi Mumbai': 'Maharashtra', 'Andheri': 'Maharashtra', 'Vasai': 'Maharashtra',
-        'Delhi': 'Delhi', 'Gurgaon': 'Haryana', 'Gurugram': 'Haryana',
-        'Noida': 'Uttar Pradesh', 'Faridabad': 'Haryana', 'Ghaziabad': 'Uttar Pradesh',
-        'Bangalore': 'Karnataka', 'Bengaluru': 'Karnataka', 'Mysore': 'Karnataka',
-        'Mangalore': 'Karnataka', 'Hyderabad': 'Telangana', 'Secunderabad': 'Telangana',
-        'Chennai': 'Tamil Nadu', 'Coimbatore': 'Tamil Nadu', 'Manali': 'Tamil Nadu',
-        'Kolkata': 'West Bengal', 'Haldia': 'West Bengal',
-        'Ahmedabad': 'Gujarat', 'Surat': 'Gujarat', 'Vadodara': 'Gujarat',
-        'Baroda': 'Gujarat', 'Jamnagar': 'Gujarat', 'Hazira': 'Gujarat',
-        'Dahej': 'Gujarat', 'Ankleshwar': 'Gujarat', 'Vapi': 'Gujarat',
-        'Visakhapatnam': 'Andhra Pradesh', 'Vizag': 'Andhra Pradesh',
-        'Kakinada': 'Andhra Pradesh', 'Rajahmundry': 'Andhra Pradesh',
-        'Jaipur': 'Rajasthan', 'Bhopal': 'Madhya Pradesh', 'Indore': 'Madhya Pradesh',
-        'Kochi': 'Kerala', 'Cochin': 'Kerala', 'Panipat': 'Haryana',
-        'Mathura': 'Uttar Pradesh', 'Lucknow': 'Uttar Pradesh', 'Kanpur': 'Uttar Pradesh',
-        'Numaligarh': 'Assam', 'Bongaigaon': 'Assam', 'Paradip': 'Odisha'
-    }
+    INDIAN_STATES = INDIAN_STATES
+    INDIAN_CITIES = INDIAN_CITIES
+    CITY_STATE_MAP = CITY_STATE_MAP
     
     KNOWN_LOCATIONS = {
         "GP Petroleums Ltd": {
@@ -122,11 +122,44 @@ class LocationDatabase:
         }
     }
     
+    _known_index = None
+    _known_matcher = None
+    
+    @classmethod
+    def _find_known(cls, company_name: str) -> Optional[Dict]:
+        """Known company whose name appears in company_name, via hash lookup then one token scan"""
+        if cls._known_matcher is None:
+            cls._known_index = {normalize_name(name): name for name in cls.KNOWN_LOCATIONS}
+            cls._known_matcher = KeywordMatcher({'known': {name: [name] for name in cls.KNOWN_LOCATIONS}})
+        
+        known_name = cls._known_index.get(normalize_name(company_name))
+        if known_name is None:
+            # Categories come back in KNOWN_LOCATIONS order, like the old linear scan
+            known_name = next(iter(cls._known_matcher.match(company_name)['known']), None)
+        return cls.KNOWN_LOCATIONS[known_name] if known_name else None
+    
+    @classmethod
+    def load_gazetteer(cls, path: str):
+        """Extend the shared gazetteer from a JSON or CSV file"""
+        default_gazetteer().load(path)
+        cls._infer_location_cached.cache_clear()
+    
+    @classmethod
+    def extract_from_text(cls, text: str) -> Optional[Dict]:
+        """First city or state mentioned in free text"""
+        return default_gazetteer().find_first(text)
+    
     @classmethod
     def infer_location(cls, company_name: str, industry: str, country: str = "India") -> Dict:
-        for known_name, location in cls.KNOWN_LOCATIONS.items():
-            if known_name.lower() in company_name.lower():
-                return {**location, "inference_method": "known_database"}
+        # Cached results are shared, so hand out copies
+        return dict(cls._infer_location_cached(company_name, industry, country))
+    
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def _infer_location_cached(cls, company_name: str, industry: str, country: str) -> Dict:
+        location = cls._find_known(company_name)
+        if location:
+            return {**location, "inference_method": "known_database"}
         
         if country != "India":
             return {
@@ -139,6 +172,22 @@ class LocationDatabase:
                 "inference_method": "country_only"
             }
         
+        # Place names in the company name itself ("Cochin Shipyard", "Haldia Petro")
+        place = cls.extract_from_text(company_name)
+        if place and place['state']:
+            parts = [p for p in (place['city'], place['state']) if p]
+            if len(parts) == 2 and parts[0] == parts[1]:
+                parts = parts[:1]
+            return {
+                "city": place['city'],
+                "state": place['state'],
+                "country": "India",
+                "full_location": ', '.join(parts + ['India']),
+                "source": "Place name in company name",
+                "confidence": "medium",
+                "inference_method": "name_gazetteer"
+            }
+        
         location = cls._infer_by_industry(company_name, industry)
         location["country"] = "India"
         location["inference_method"] = "industry_pattern"
@@ -220,7 +269,28 @@ class LocationDatabase:
             "confidence": "low"
         }
 
+def company_key(company: Dict) -> str:
+    """Stable key for a company record, independent of its position in the input"""
+    return normalize_name(company.get('company_name') or company.get('name', ''))
+
+
+def company_rng(key: str, stream: str, seed: int) -> random.Random:
+    """Random generator seeded from the run seed, the company key and the generator using it
+    
+    Each generator gets its own stream, so drawing more values in one of them
+    doesn't shift what the others produce. Memoized generators take seed as a
+    cache argument and pass it on, so changing Config.GENERATION_SEED never
+    hands back results drawn under the old seed.
+    """
+    material = f"{seed}|{ProjectTemplates.TEMPLATE_VERSION}|{stream}|{key}"
+    return random.Random(int.from_bytes(hashlib.sha256(material.encode()).digest()[:8], 'big'))
+
+
 class ProjectTemplates:
+    # Bump when templates or generation logic change so cached and seeded
+    # outputs move to a new stream
+    TEMPLATE_VERSION = 1
+    
     TEMPLATES = {
         'Petroleum & Petrochemicals': [
             ('Refinery Modernization Project', 'Upgrading existing refinery infrastructure with advanced processing units'),
@@ -258,7 +328,22 @@ class ProjectTemplates:
     }
     
     @classmethod
-    def generate_projects(cls, industry: str, num_projects: int = 2) -> List[Dict]:
+    def generate_projects(cls, industry: str, num_projects: int = 2,
+                          company: Optional[str] = None) -> List[Dict]:
+        """Projects for a company, identical every time for the same company and industry
+        
+        company is a stable key such as company_key(record); without one the
+        industry alone seeds the selection.
+        """
+        return copy.deepcopy(cls._generate_projects_cached(
+            company or '', industry, num_projects, cls.TEMPLATE_VERSION, Config.GENERATION_SEED
+        ))
+    
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _generate_projects_cached(cls, company: str, industry: str, num_projects: int,
+                                  version: int, seed: int) -> List[Dict]:
+        rng = company_rng(company or industry, 'projects', seed)
         templates = None
         for key in cls.TEMPLATES:
             if key.lower() in industry.lower():
@@ -269,7 +354,7 @@ class ProjectTemplates:
             templates = cls.TEMPLATES['Petroleum & Petrochemicals']
         
         num_to_select = min(num_projects, len(templates))
-        selected = random.sample(templates, num_to_select)
+        selected = rng.sample(templates, num_to_select)
         
         statuses = ['in_development', 'launching_soon', 'ongoing', 'planned']
         
@@ -278,7 +363,7 @@ class ProjectTemplates:
             projects.append({
                 'project_name': name,
                 'project_description': desc,
-                'project_status': random.choice(statuses)
+                'project_status': rng.choice(statuses)
             })
         
         return projects
@@ -317,7 +402,17 @@ class SignalPatterns:
     }
     
     @classmethod
-    def get_pattern(cls, project_count: int, industry: str) -> Tuple[str, Dict]:
+    def get_pattern(cls, project_count: int, industry: str,
+                    company: Optional[str] = None) -> Tuple[str, Dict]:
+        level = cls._get_level_cached(
+            company or '', project_count, industry, ProjectTemplates.TEMPLATE_VERSION, Config.GENERATION_SEED
+        )
+        return level, cls.PATTERNS[level]
+    
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _get_level_cached(cls, company: str, project_count: int, industry: str,
+                          version: int, seed: int) -> str:
         active_industries = ['petroleum', 'oil', 'gas', 'steel', 'infrastructure']
         is_active_industry = any(ind in industry.lower() for ind in active_industries)
         
@@ -328,8 +423,8 @@ class SignalPatterns:
         else:
             weights = [0.2, 0.5, 0.3]
         
-        level = random.choices(['high', 'medium', 'low'], weights=weights)[0]
-        return level, cls.PATTERNS[level]
+        rng = company_rng(company or industry, 'signals', seed)
+        return rng.choices(['high', 'medium', 'low'], weights=weights)[0]
 
 class HPCLPartnershipAnalyzer:
     RAW_MATERIALS = {
@@ -357,33 +452,43 @@ class HPCLPartnershipAnalyzer:
     
     @classmethod
     def generate_opportunities(cls, company: Dict, projects: List[Dict]) -> Dict:
-        industry = company.get('industry_sector', '')
-        company_name = company.get('company_name', '')
-        
+        """Opportunities for a company, identical every time for the same company, industry and projects"""
+        project_keys = tuple((p['project_name'], p['project_status']) for p in projects)
+        return copy.deepcopy(cls._generate_opportunities_cached(
+            company_key(company), company.get('company_name', ''), company.get('industry_sector', ''),
+            project_keys, ProjectTemplates.TEMPLATE_VERSION, Config.GENERATION_SEED
+        ))
+    
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _generate_opportunities_cached(cls, key: str, company_name: str, industry: str,
+                                       project_keys: Tuple[Tuple[str, str], ...], version: int,
+                                       seed: int) -> Dict:
+        rng = company_rng(key, 'opportunities', seed)
         raw_materials = cls.RAW_MATERIALS.get(industry, cls.RAW_MATERIALS['Default'])
-        selected_materials = random.sample(raw_materials, min(3, len(raw_materials)))
-        selected_partnerships = random.sample(cls.PARTNERSHIP_OPS, min(3, len(cls.PARTNERSHIP_OPS)))
+        selected_materials = rng.sample(raw_materials, min(3, len(raw_materials)))
+        selected_partnerships = rng.sample(cls.PARTNERSHIP_OPS, min(3, len(cls.PARTNERSHIP_OPS)))
         
         project_opportunities = []
-        for project in projects:
-            value = random.randint(20, 200)
+        for project_name, project_status in project_keys:
+            value = rng.randint(20, 200)
             project_opportunities.append({
-                'project_name': project['project_name'],
-                'hpcl_role': f"Supply of specialty chemicals and raw materials for {project['project_name'].lower()}",
+                'project_name': project_name,
+                'hpcl_role': f"Supply of specialty chemicals and raw materials for {project_name.lower()}",
                 'estimated_requirement': f"₹{value} Cr over project lifecycle",
-                'procurement_stage': project['project_status'].replace('_', ' ').title()
+                'procurement_stage': project_status.replace('_', ' ').title()
             })
         
         leads = [
             {
                 'contact_department': 'Procurement & Supply Chain',
-                'potential_value': f"High (₹{random.randint(50, 500)} Cr annually)",
-                'timeline': f"Q{random.randint(1,4)} 2026 - Tender expected",
+                'potential_value': f"High (₹{rng.randint(50, 500)} Cr annually)",
+                'timeline': f"Q{rng.randint(1,4)} 2026 - Tender expected",
                 'decision_makers': 'VP-Procurement, GM-Technical'
             },
             {
                 'contact_department': 'Business Development',
-                'potential_value': f"Medium (₹{random.randint(20, 100)} Cr annually)",
+                'potential_value': f"Medium (₹{rng.randint(20, 100)} Cr annually)",
                 'timeline': 'Ongoing discussions',
                 'decision_makers': 'Director-Strategy, Head-Partnerships'
             }
@@ -410,10 +515,326 @@ class HPCLPartnershipAnalyzer:
             ]
         }
 
+class CompanyCrawler:
+    """Bounded same-domain crawler that turns company websites into leads"""
+    
+    INDUSTRY_NAMES = {
+        'petroleum_petrochemicals': 'Petroleum & Petrochemicals',
+        'chemicals': 'Chemicals',
+        'pharmaceuticals': 'Pharmaceuticals',
+        'other': 'Other'
+    }
+    
+    FACILITY_TYPES = {
+        'Petroleum & Petrochemicals': 'refinery/petrochemical_plant',
+        'Pharmaceuticals': 'pharmaceutical_plant',
+        'Chemicals': 'corporate_office'
+    }
+    
+    PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+    
+    SIGNAL_TERMS = {
+        'procurement': ['tender', 'procurement', 'rfq', 'eoi', 'vendor registration', 'bid'],
+        'partnership': ['partnership', 'mou', 'joint venture', 'collaboration', 'alliance'],
+        'investment': ['investment', 'capex', 'crore', 'funding', 'invest'],
+        'construction': ['construction', 'commissioning', 'greenfield', 'brownfield', 'epc'],
+        'expansion': ['expansion', 'capacity addition', 'new plant', 'new facility', 'expand'],
+        'technology': ['technology', 'digital', 'hydrogen', 'carbon capture', 'automation']
+    }
+    
+    EXTRACTION_METHOD = 'Web Crawler v1.0'
+    
+    STATUS_TERMS = [
+        ('planned', ['planned', 'proposed', 'upcoming']),
+        ('launching_soon', ['launch', 'inaugurat', 'foundation stone']),
+        ('ongoing', ['under construction', 'in progress', 'ongoing', 'underway'])
+    ]
+    
+    SKIP_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.doc', '.docx',
+                       '.xls', '.xlsx', '.ppt', '.pptx', '.mp4', '.css', '.js')
+    
+    def __init__(self, config: Config, metrics: Optional[Metrics] = None):
+        self.config = config
+        self.metrics = metrics or Metrics('company_scraper')
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.USER_AGENT})
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=config.CRAWL_CONCURRENCY, pool_maxsize=config.CRAWL_CONCURRENCY
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.rate_limiter = HostRateLimiter(default_rate=1.0 / config.RATE_LIMIT_DELAY)
+        self.keyword_pattern = re.compile(
+            r'\b(' + '|'.join(map(re.escape, config.PROJECT_KEYWORDS)) + r')s?\b', re.I
+        )
+        self.signal_patterns = {
+            signal: re.compile(r'\b(?:' + '|'.join(map(re.escape, terms)) + r')', re.I)
+            for signal, terms in self.SIGNAL_TERMS.items()
+        }
+        self.pages_fetched = 0
+        self.lock = threading.Lock()
+    
+    def load_targets(self) -> List[Dict]:
+        """Enabled companies from the dataset, high priority first"""
+        with open(self.config.COMPANIES_JSON, 'r', encoding='utf-8') as f:
+            companies = json.load(f)
+        # IDs follow dataset position so they stay stable whatever gets scheduled
+        targets = [
+            {**c, 'company_id': f"C{i + 1:04d}"}
+            for i, c in enumerate(companies) if c.get('enabled', True) and c.get('website')
+        ]
+        # sort is stable, so file order is kept within a priority level
+        targets.sort(key=lambda c: self.PRIORITY_ORDER.get(c.get('priority', 'low'), len(self.PRIORITY_ORDER)))
+        return targets
+    
+    def fetch(self, url: str, max_attempts: Optional[int] = None) -> Tuple[Optional[str], int]:
+        """Fetch an HTML page, honouring the per-host rate limit
+        
+        Returns the page (None on failure or non-HTML content) and the number
+        of HTTP requests made, at most max_attempts (default MAX_RETRIES).
+        """
+        host = urlparse(url).netloc.lower()
+        if not self.rate_limiter.allow(host):
+            return None, 0
+        
+        max_attempts = min(max_attempts or self.config.MAX_RETRIES, self.config.MAX_RETRIES)
+        attempts = 0
+        for attempt in range(max_attempts):
+            attempts += 1
+            try:
+                self.rate_limiter.acquire(host)
+                start = time.perf_counter()
+                response = self.session.get(url, timeout=self.config.TIMEOUT)
+                self.metrics.fetch(host, time.perf_counter() - start, len(response.content), response.status_code)
+                with self.lock:
+                    self.pages_fetched += 1
+                if response.status_code in (429, 503):
+                    self.rate_limiter.throttle(host, response.headers.get('Retry-After'), attempt)
+                    continue
+                response.raise_for_status()
+                self.rate_limiter.record_success(host)
+                if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                    return None, attempts
+                return response.text, attempts
+            except requests.exceptions.RequestException as e:
+                self.metrics.inc('fetch_errors_total', host=host)
+                status = getattr(e.response, 'status_code', None)
+                if status and 400 <= status < 500:
+                    # A dead link won't come back on retry and says nothing
+                    # about the host, so it doesn't count towards the breaker
+                    logger.debug(f"{url} returned HTTP {status}, not retrying")
+                    return None, attempts
+                logger.debug(f"Attempt {attempt + 1} failed for {url}: {e}")
+                time.sleep(self.rate_limiter.backoff_delay(attempt))
+        
+        self.rate_limiter.record_failure(host)
+        return None, attempts
+    
+    def extract_links(self, soup: BeautifulSoup, base_url: str, domain: str) -> List[str]:
+        links = []
+        for anchor in soup.find_all('a', href=True):
+            url, _ = urldefrag(urljoin(base_url, anchor['href']))
+            parsed = urlparse(url)
+            if parsed.scheme not in ('http', 'https'):
+                continue
+            if parsed.netloc.lower().removeprefix('www.') != domain:
+                continue
+            if parsed.path.lower().endswith(self.SKIP_EXTENSIONS):
+                continue
+            links.append(url)
+        return links
+    
+    def crawl_company(self, company: Dict,
+                      max_pages: Optional[int] = None) -> Tuple[List[Tuple[str, BeautifulSoup]], int]:
+        """Breadth-first crawl of a company website within the depth and request budget
+        
+        max_pages caps HTTP requests, not pages kept: retries, failed links
+        and non-HTML responses are charged too. Returns the pages and the
+        requests made.
+        """
+        max_pages = max_pages or self.config.CRAWL_MAX_PAGES
+        start_url = company['website']
+        domain = urlparse(start_url).netloc.lower().removeprefix('www.')
+        queue = deque([(start_url, 0)])
+        seen = {start_url}
+        pages = []
+        requests_made = 0
+        
+        while queue and requests_made < max_pages:
+            url, depth = queue.popleft()
+            html, attempts = self.fetch(url, max_pages - requests_made)
+            requests_made += attempts
+            if html is None:
+                continue
+            soup = BeautifulSoup(html, 'html.parser')
+            pages.append((url, soup))
+            if depth >= self.config.CRAWL_MAX_DEPTH:
+                continue
+            for link in self.extract_links(soup, url, domain):
+                if link not in seen:
+                    seen.add(link)
+                    queue.append((link, depth + 1))
+        
+        return pages, requests_made
+    
+    def extract_projects(self, pages: List[Tuple[str, BeautifulSoup]], limit: int = 5) -> List[Dict]:
+        """Headings that mention project keywords, with the following paragraph as description"""
+        projects = []
+        seen_names = set()
+        for _, soup in pages:
+            # h1 is usually the site or page title, so start at h2
+            for heading in soup.find_all(['h2', 'h3', 'h4']):
+                name = heading.get_text(' ', strip=True)
+                if not 8 <= len(name) <= 120 or name.lower() in seen_names:
+                    continue
+                if not self.keyword_pattern.search(name):
+                    continue
+                seen_names.add(name.lower())
+                paragraph = heading.find_next('p')
+                description = paragraph.get_text(' ', strip=True)[:300] if paragraph else name
+                projects.append({
+                    'project_name': name,
+                    'project_description': description,
+                    'project_status': self.infer_status(f"{name} {description}")
+                })
+                if len(projects) >= limit:
+                    return projects
+        return projects
+    
+    def infer_status(self, text: str) -> str:
+        text_lower = text.lower()
+        for status, terms in self.STATUS_TERMS:
+            if any(term in text_lower for term in terms):
+                return status
+        return 'in_development'
+    
+    @classmethod
+    def signal_scores(cls, signals: List[str], keyword_count: int) -> Tuple[str, float, float]:
+        """Signal level plus urgency and confidence placed within that level's ranges
+        
+        The 'monitoring' placeholder stored for pages without signals counts
+        as one signal but doesn't raise the level.
+        """
+        signals = [signal for signal in signals if signal in cls.SIGNAL_TERMS]
+        high_signals = set(SignalPatterns.PATTERNS['high']['signals'])
+        medium_signals = set(SignalPatterns.PATTERNS['medium']['signals'])
+        if high_signals.intersection(signals):
+            level = 'high'
+        elif medium_signals.intersection(signals):
+            level = 'medium'
+        else:
+            level = 'low'
+        
+        pattern = SignalPatterns.PATTERNS[level]
+        urgency_low, urgency_high = pattern['urgency_range']
+        confidence_low, confidence_high = pattern['confidence_range']
+        urgency = urgency_low + (urgency_high - urgency_low) * min(max(len(signals), 1) / 4, 1.0)
+        confidence = confidence_low + (confidence_high - confidence_low) * min(keyword_count / 10, 1.0)
+        return level, urgency, confidence
+    
+    def analyze(self, company: Dict, pages: List[Tuple[str, BeautifulSoup]], company_id: str) -> Dict:
+        """Score projects, signals and keywords found on the crawled pages"""
+        text = ' '.join(soup.get_text(' ', strip=True) for _, soup in pages)
+        industry = self.INDUSTRY_NAMES.get(company.get('industry'), company.get('industry', 'Other'))
+        
+        keywords_matched = sorted({m.lower() for m in self.keyword_pattern.findall(text)})
+        signals = [signal for signal, pattern in self.signal_patterns.items() if pattern.search(text)]
+        projects = self.extract_projects(pages)
+        
+        level, urgency, confidence = self.signal_scores(signals, len(keywords_matched))
+        if not signals:
+            signals = ['monitoring']
+        pattern = SignalPatterns.PATTERNS[level]
+        overall = urgency * self.config.URGENCY_WEIGHT + confidence * self.config.CONFIDENCE_WEIGHT
+        
+        record = {
+            'company_id': company_id,
+            'company_name': company['name'],
+            'source_type': 'company_website',
+            'source_url': company['website'],
+            'projects': projects,
+            'industry_sector': industry,
+            'location': ', '.join(company.get('locations', [])) or 'India',
+            'facility_type': self.FACILITY_TYPES.get(industry, 'corporate_office'),
+            'signals': signals,
+            'signal_strength': level,
+            'keywords_matched': keywords_matched,
+            'urgency_score': round(urgency, 2),
+            'confidence_score': round(confidence, 2),
+            'overall_score': round(overall, 2),
+            'next_action': pattern['actions'][0],
+            'discovery_date': datetime.now().isoformat(),
+            'extraction_method': self.EXTRACTION_METHOD,
+            'pages_crawled': len(pages),
+            'priority': company.get('priority', 'low'),
+            'potential_products': company.get('potential_products', [])
+        }
+        record['hpcl_partnership_opportunities'] = HPCLPartnershipAnalyzer.generate_opportunities(record, projects)
+        return record
+    
+    def crawl_and_analyze(self, company: Dict, company_id: str,
+                          max_pages: Optional[int] = None) -> Optional[Dict]:
+        try:
+            pages, requests_made = self.crawl_company(company, max_pages)
+        except Exception as e:
+            logger.error(f"Error crawling {company.get('website')}: {e}")
+            return None
+        if not pages:
+            logger.warning(f"No pages fetched for {company['name']} ({company['website']})")
+            return None
+        record = self.analyze(company, pages, company_id)
+        record['requests_made'] = requests_made
+        return record
+    
+    def crawl_all(self, companies: List[Dict],
+                  page_budgets: Optional[Dict[str, int]] = None) -> List[Dict]:
+        """Crawl companies concurrently; results keep the input order"""
+        page_budgets = page_budgets or {}
+        with ThreadPoolExecutor(max_workers=self.config.CRAWL_CONCURRENCY) as executor:
+            futures = [
+                executor.submit(
+                    self.crawl_and_analyze, company,
+                    company.get('company_id', f"C{i + 1:04d}"),
+                    page_budgets.get(company['website'])
+                )
+                for i, company in enumerate(companies)
+            ]
+            results = [future.result() for future in futures]
+        self.rate_limiter.save()
+        return [record for record in results if record is not None]
+    
+    def crawl_scheduled(self, frontier: CrawlFrontier, request_budget: Optional[int] = None) -> List[Dict]:
+        """Spend a fixed request budget on the companies most likely to have changed"""
+        targets = self.load_targets()
+        frontier.sync(targets)
+        plan = frontier.schedule(
+            request_budget or self.config.CRAWL_REQUEST_BUDGET,
+            self.config.CRAWL_MAX_PAGES,
+            [c['website'] for c in targets]
+        )
+        by_website = {c['website']: c for c in targets}
+        page_budgets = dict(plan)
+        
+        # Crawl in schedule order so the most valuable companies start first
+        scheduled = [by_website[website] for website, _ in plan]
+        results = self.crawl_all(scheduled, page_budgets)
+        
+        crawled = {record['source_url']: record for record in results}
+        for website, _ in plan:
+            record = crawled.get(website)
+            if record is None:
+                frontier.record_failure(website)
+            else:
+                frontier.record(website, record['overall_score'], record['requests_made'],
+                                record_fingerprint(record))
+        return results
+
 class ComprehensiveScraper:
     def __init__(self):
         self.config = Config()
         self.location_db = LocationDatabase()
+        self.metrics = Metrics('company_scraper')
+        self.crawler = CompanyCrawler(self.config, self.metrics)
         self.stats = {
             'companies_processed': 0,
             'projects_generated': 0,
@@ -422,11 +843,15 @@ class ComprehensiveScraper:
             'start_time': datetime.now()
         }
     
-    def load_company_data(self) -> List[Dict]:
+    def load_company_data(self, offset: int = 0, count: Optional[int] = None) -> Iterator[Dict]:
+        """Stream company records from INPUT_JSON (JSON array or NDJSON)
+        
+        offset and count select a shard; count defaults to TOP_N_COMPANIES.
+        """
+        if count is None:
+            count = self.config.TOP_N_COMPANIES
         try:
-            with open(self.config.INPUT_JSON, 'r') as f:
-                data = json.load(f)
-            return data[:self.config.TOP_N_COMPANIES]
+            yield from iter_records(self.config.INPUT_JSON, offset, count)
         except Exception as e:
             logger.error(f"Failed to load JSON file: {e}")
             raise
@@ -519,14 +944,15 @@ class ComprehensiveScraper:
         self.stats['companies_processed'] += 1
         return enhanced
     
-    def generate_report_html(self, results: List[Dict]) -> str:
-        total_projects = sum(len(r['projects']) for r in results)
-        high_priority = sum(1 for r in results if r['overall_score'] >= 0.7)
-        avg_score = sum(r['overall_score'] for r in results) / len(results)
-        top_10 = sorted(results, key=lambda x: x['overall_score'], reverse=True)[:10]
+    def generate_report_html(self, aggregates: Dict) -> str:
+        total_companies = aggregates['total'] or 1
+        total_projects = aggregates['total_projects']
+        high_priority = aggregates['high_priority']
+        avg_score = aggregates['avg_score']
+        top_10 = aggregates['top']
         
-        india_companies = sum(1 for r in results if r.get('country') == 'India')
-        companies_with_state = sum(1 for r in results if r.get('state'))
+        india_companies = aggregates['india_companies']
+        companies_with_state = aggregates['companies_with_state']
         
         html = f"""
 <!DOCTYPE html>
@@ -558,7 +984,7 @@ class ComprehensiveScraper:
     <div class="section">
         <h2>📈 Overview Statistics</h2>
         <div class="stat">
-            <div class="stat-value">{len(results)}</div>
+            <div class="stat-value">{aggregates['total']}</div>
             <div class="stat-label">Companies Processed</div>
         </div>
         <div class="stat">
@@ -601,43 +1027,170 @@ class ComprehensiveScraper:
     
     <div class="section">
         <h2>📍 Location Analysis</h2>
-        <p><strong>India-based companies:</strong> {india_companies} ({india_companies/len(results)*100:.1f}%)</p>
-        <p><strong>Companies with state data:</strong> {companies_with_state} ({companies_with_state/len(results)*100:.1f}%)</p>
-        <p><strong>Location enhancement rate:</strong> {self.stats['locations_enhanced']/len(results)*100:.1f}%</p>
+        <p><strong>India-based companies:</strong> {india_companies} ({india_companies/total_companies*100:.1f}%)</p>
+        <p><strong>Companies with state data:</strong> {companies_with_state} ({companies_with_state/total_companies*100:.1f}%)</p>
+        <p><strong>Location enhancement rate:</strong> {self.stats['locations_enhanced']/total_companies*100:.1f}%</p>
     </div>
 </body>
 </html>
 """
         return html
     
-    def run(self) -> List[Dict]:
-        companies = self.load_company_data()
-        results = []
+    def run(self, crawl: bool = False, request_budget: Optional[int] = None,
+            offset: int = 0, count: Optional[int] = None) -> Dict:
+        """Enhance company records one at a time, streaming them to OUTPUT_JSON
+        
+        Returns the report aggregates; records are not kept in memory.
+        """
+        # Crawl mode builds records from the live websites of enabled companies,
+        # chosen by the crawl frontier within the request budget, instead of
+        # enhancing the first TOP_N_COMPANIES records
+        if crawl:
+            frontier = CrawlFrontier(self.config.CRAWL_FRONTIER_DB, self.config.CRAWL_FRESHNESS_HOURS)
+            try:
+                companies = self.crawler.crawl_scheduled(frontier, request_budget)
+            finally:
+                frontier.close()
+        else:
+            companies = self.load_company_data(offset, count)
+        aggregator = ReportAggregator(top_n=10)
         
+        with StreamingJSONWriter(self.config.OUTPUT_JSON) as writer:
+            self.enhance_records(companies, writer, aggregator)
+        
+        return self.write_report(aggregator.result())
+    
+    def enhance_records(self, companies: Iterator[Dict], writer: StreamingJSONWriter,
+                        aggregator: ReportAggregator):
         for company in companies:
             try:
-                enhanced = self.enhance_existing_company(company)
-                results.append(enhanced)
+                with self.metrics.stage('enhance'):
+                    enhanced = self.enhance_existing_company(company)
                 if enhanced.get('overall_score', 0) >= 0.7:
                     self.stats['high_priority'] += 1
                 self.stats['projects_generated'] += len(enhanced.get('projects', []))
             except Exception as e:
-                results.append(company)
-                continue
+                self.metrics.inc('enhance_errors_total')
+                enhanced = company
+            with self.metrics.stage('write'):
+                writer.write(enhanced)
+            aggregator.add(enhanced)
+    
+    def enhance_shard(self, offset: int, count: int, path: str) -> ReportAggregator:
+        """Enhance one shard of the input into its own file"""
+        aggregator = ReportAggregator(top_n=10, start=offset)
+        with StreamingJSONWriter(path) as writer:
+            self.enhance_records(self.load_company_data(offset, count), writer, aggregator)
+        return aggregator
+    
+    def merge_stats(self, stats: Dict):
+        for key in ('companies_processed', 'projects_generated', 'locations_enhanced', 'high_priority'):
+            self.stats[key] += stats[key]
+    
+    def run_sharded(self, shards: int, offset: int = 0, count: Optional[int] = None,
+                    workers: Optional[int] = None) -> Dict:
+        """run() split into contiguous shards enhanced in a process pool
         
-        with open(self.config.OUTPUT_JSON, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        Each shard is written to OUTPUT_JSON.shardNNN.ndjson, then the shard
+        files are concatenated in input order, so the output is the same as a
+        single-process run.
+        """
+        if count is None:
+            count = self.config.TOP_N_COMPANIES
+        size = max(-(-count // max(shards, 1)), 1)
+        ranges = [(start, min(size, offset + count - start)) for start in range(offset, offset + count, size)]
+        paths = [f"{self.config.OUTPUT_JSON}.shard{i:03d}.ndjson" for i in range(len(ranges))]
+        workers = workers or min(len(ranges), os.cpu_count() or 1) or 1
+        logger.info(f"Enhancing {count} companies in {len(ranges)} shards on {workers} workers")
         
-        html_report = self.generate_report_html(results)
-        with open(self.config.OUTPUT_REPORT, 'w', encoding='utf-8') as f:
-            f.write(html_report)
+        aggregator = ReportAggregator(top_n=10)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_enhance_shard, self.config.INPUT_JSON, shard_offset, shard_count, path)
+                for (shard_offset, shard_count), path in zip(ranges, paths)
+            ]
+            for future in futures:
+                stats, shard_aggregator, shard_metrics = future.result()
+                self.merge_stats(stats)
+                aggregator.merge(shard_aggregator)
+                self.metrics.merge(shard_metrics)
         
-        return results
+        with self.metrics.stage('merge_shards'), StreamingJSONWriter(self.config.OUTPUT_JSON) as writer:
+            for path in paths:
+                for record in iter_records(path):
+                    writer.write(record)
+        for path in paths:
+            os.remove(path)
+        
+        return self.write_report(aggregator.result())
+    
+    def write_report(self, aggregates: Dict) -> Dict:
+        with self.metrics.stage('report'):
+            html_report = self.generate_report_html(aggregates)
+            with open(self.config.OUTPUT_REPORT, 'w', encoding='utf-8') as f:
+                f.write(html_report)
+        self.export_metrics()
+        return aggregates
+    
+    def snapshot_caches(self):
+        for name, cached in (('infer_location', LocationDatabase._infer_location_cached),
+                             ('generate_projects', ProjectTemplates._generate_projects_cached),
+                             ('generate_opportunities', HPCLPartnershipAnalyzer._generate_opportunities_cached)):
+            info = cached.cache_info()
+            self.metrics.cache(name, info.hits, info.misses)
+    
+    def export_metrics(self):
+        """Snapshot run counters and cache ratios and write them to METRICS_PATH"""
+        for key in ('companies_processed', 'projects_generated', 'locations_enhanced', 'high_priority'):
+            self.metrics.set(key, self.stats[key])
+        self.metrics.set('pages_fetched', self.crawler.pages_fetched)
+        self.metrics.set('run_seconds', (datetime.now() - self.stats['start_time']).total_seconds())
+        self.snapshot_caches()
+        if self.config.METRICS_PATH:
+            try:
+                self.metrics.write(self.config.METRICS_PATH)
+            except OSError as e:
+                logger.error(f"Error writing metrics: {e}")
+
+
+def _enhance_shard(input_json: str, offset: int, count: int,
+                   path: str) -> Tuple[Dict, ReportAggregator, Metrics]:
+    """Process pool entry point: enhance one shard, return its stats, aggregates and metrics"""
+    scraper = ComprehensiveScraper()
+    scraper.config.INPUT_JSON = input_json
+    aggregator = scraper.enhance_shard(offset, count, path)
+    scraper.snapshot_caches()
+    return scraper.stats, aggregator, scraper.metrics
 
 def main():
+    parser = argparse.ArgumentParser(description='Company intelligence scraper')
+    parser.add_argument('--crawl', action='store_true',
+                        help=f'crawl company websites from {Config.COMPANIES_JSON}')
+    parser.add_argument('--budget', type=int, default=None,
+                        help=f'requests per crawl run (default {Config.CRAWL_REQUEST_BUDGET})')
+    parser.add_argument('--offset', type=int, default=0,
+                        help='index of the first input record to process')
+    parser.add_argument('--count', type=int, default=None,
+                        help=f'number of input records to process (default {Config.TOP_N_COMPANIES})')
+    parser.add_argument('--all', action='store_true',
+                        help='process every input record from --offset on')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='split the input into this many shards enhanced in parallel')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for --shards (default: one per CPU)')
+    args = parser.parse_args()
+    
     try:
         scraper = ComprehensiveScraper()
-        results = scraper.run()
+        count = args.count
+        if args.all:
+            count = max(count_records(scraper.config.INPUT_JSON) - args.offset, 0)
+        if args.shards > 1 and not args.crawl:
+            results = scraper.run_sharded(args.shards, offset=args.offset, count=count,
+                                          workers=args.workers)
+        else:
+            results = scraper.run(crawl=args.crawl, request_budget=args.budget,
+                                  offset=args.offset, count=count)
         return results
     except Exception as e:
         raise